@@ -9,28 +9,32 @@ for automatic stage generation.
 import sys
 import os
 import argparse
-from src.core.game_manager import GameManager
-from src.utils.config import Config
 
+# Game modules import each other from the src/ root (e.g. utils.config)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
 
-def parse_arguments():
-    """Parse command line arguments"""
-    parser = argparse.ArgumentParser(description='Everyday Rhythm - Simple Rhythm Game')
-    parser.add_argument('--debug', action='store_true', help='Enable debug mode')
-    parser.add_argument('--stage', type=str, help='Load specific stage file')
-    parser.add_argument('--test-mode', action='store_true', help='Run in test mode')
-    parser.add_argument('--audio', type=str, help='Load and play audio file for testing')
-    parser.add_argument('--volume', type=float, default=0.7, help='Set audio volume (0.0-1.0)')
-    return parser.parse_args()
+from utils.config import Config  # noqa: E402
 
 
-def main():
+# Built once at import; parse_arguments() only parses
+_PARSER = argparse.ArgumentParser(description='Everyday Rhythm - Simple Rhythm Game')
+_PARSER.add_argument('--debug', action='store_true', help='Enable debug mode')
+_PARSER.add_argument('--test-mode', action='store_true', help='Run in test mode')
+_PARSER.add_argument('--audio', type=str, help='Load and play audio file for testing')
+_PARSER.add_argument('--volume', type=float, default=0.7, help='Set audio volume (0.0-1.0)')
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments (defaults to sys.argv)"""
+    return _PARSER.parse_args(argv)
+
+
+def main(argv=None):
     """Main game entry point"""
-    args = parse_arguments()
+    args = parse_arguments(argv)
     
     # Override debug mode if specified
     if args.debug:
-        import os
         os.environ['DEBUG_MODE'] = 'true'
         # Reload config to pick up the change
         Config.DEBUG_MODE = True
@@ -40,16 +44,10 @@ def main():
         Config.validate()
         
         if Config.is_debug():
-            print("=== Everyday Rhythm ===")
-            print(f"Debug mode: {Config.DEBUG_MODE}")
-            print(f"Window size: {Config.get_window_size()}")
-            print(f"Target FPS: {Config.TARGET_FPS}")
-            print(f"Audio buffer: {Config.AUDIO_BUFFER_SIZE}")
-            if Config.AMAZON_Q_API_KEY:
-                print("Amazon Q API: Configured")
-            else:
-                print("Amazon Q API: Not configured")
-            print("========================")
+            print(Config.debug_banner())
+        
+        # Imported here so --help does not pay for pygame/audio imports
+        from core.game_manager import GameManager
         
         # Create and run game
         game_manager = GameManager()
@@ -68,7 +66,6 @@ def main():
         
         # Load audio file if provided
         if args.audio:
-            import os  # Ensure os is available in this scope
             if os.path.exists(args.audio):
                 print(f"Loading audio file: {args.audio}")
                 if game_manager.load_audio(args.audio):
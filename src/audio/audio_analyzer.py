@@ -2,32 +2,92 @@
 AudioAnalyzer - Audio analysis and feature extraction using librosa
 """
 import os
-import sys
+import importlib.util
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
-# Add src to path for imports (must be before local imports)
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from utils.config import Config
 
-# Local imports after path setup
-from utils.config import Config  # noqa: E402
+# librosa is imported on first use; its cold import (numba/scipy) is slow
+LIBROSA_AVAILABLE = importlib.util.find_spec("librosa") is not None
+if not LIBROSA_AVAILABLE and Config.is_debug():
+    print("Warning: librosa not available. Audio analysis features disabled.")
 
-try:
-    import librosa
-    import librosa.feature
-    import librosa.beat
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
-    if Config.is_debug():
-        print("Warning: librosa not available. Audio analysis features disabled.")
+_librosa_module = None
+
+
+def _librosa():
+    """Import librosa and the submodules used for analysis on first call"""
+    global _librosa_module
+    if _librosa_module is None:
+        import librosa
+        import librosa.feature
+        import librosa.beat
+        import librosa.onset
+        _librosa_module = librosa
+    return _librosa_module
+
+
+def _rms_energy(y: np.ndarray) -> float:
+    """
+    Global RMS energy of the signal
+    
+    This is sqrt(mean(y**2)) over the whole signal, not the mean of
+    librosa's per-frame RMS that rms_energy used to report. The whole-signal
+    value is never lower, and for audio with loud and quiet passages it is
+    noticeably higher (about a third higher for a tone that drops from loud
+    to quiet halfway through), so rms_energy values are not comparable with
+    results from before the change.
+    """
+    if y.size == 0:
+        return 0.0
+    y32 = y.astype(np.float32, copy=False)
+    return float(np.sqrt(np.mean(y32 * y32)))
+
+
+def _zero_crossing_rate(y: np.ndarray) -> float:
+    """
+    Fraction of adjacent sample pairs that change sign
+    
+    Single pass over the signal instead of librosa's framed ZCR, whose
+    mean differs only by frame padding at the edges.
+    """
+    if y.size < 2:
+        return 0.0
+    return float(np.mean(np.diff(np.signbit(y))))
+
+
+def _copy_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a cached analysis result that callers may modify freely"""
+    return {**analysis, 'beats': list(analysis['beats'])}
 
 
 class AudioAnalyzer:
     """Analyzes audio files for tempo, beats, and other musical features"""
     
+    # Number of decoded files kept in memory
+    LOAD_CACHE_SIZE = 8
+    
+    # Analysis runs on mono audio at a fixed rate; fast resampling is
+    # sufficient for tempo/beat detection
+    ANALYSIS_SAMPLE_RATE = 22050
+    RESAMPLE_TYPE = 'soxr_lq'
+    
+    # Files at least this long (seconds) are streamed block by block for
+    # feature extraction instead of being decoded fully into memory
+    STREAM_MIN_DURATION = 60.0
+    STREAM_BLOCK_FRAMES = 64
+    STREAM_FRAME_LENGTH = 4096
+    CENTROID_N_FFT = 2048
+    
     def __init__(self):
         """Initialize the audio analyzer"""
+        # Decoded audio keyed by (path, mtime, size)
+        self._load_cache: Dict[Tuple[str, float, int], Tuple[np.ndarray, int]] = {}
+        
+        # Analysis results per file, keyed like the load cache
+        self._result_cache: Dict[Tuple[str, float, int], Dict[str, Any]] = {}
+        
         if not LIBROSA_AVAILABLE:
             if Config.is_debug():
                 print("AudioAnalyzer initialized without librosa support")
@@ -45,41 +105,36 @@ class AudioAnalyzer:
         Returns:
             Dictionary containing analysis results
         """
-        if not LIBROSA_AVAILABLE:
-            if Config.is_debug():
-                print("Audio analysis not available - librosa not installed")
-            return {}
-        
-        if not file_path or not os.path.exists(file_path):
-            if Config.is_debug():
-                print(f"Audio file not found: {file_path}")
+        key = self._validate(file_path)
+        if key is None:
             return {}
         
         try:
+            cached = self._result_cache.get(key, {})
+            if 'analysis' in cached:
+                return _copy_analysis(cached['analysis'])
+            
             # Load audio file
-            y, sr = librosa.load(file_path)
+            y, sr = self._load_audio(key)
             
             # Basic audio properties
             duration = len(y) / sr
             
             # Tempo and beat analysis
-            tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-            
-            # Convert beat frames to time
-            beat_times = librosa.frames_to_time(beats, sr=sr)
+            tempo, beat_times = self._track_beats(key)
             
             # Audio features
-            rms = librosa.feature.rms(y=y)
-            zcr = librosa.feature.zero_crossing_rate(y)
+            rms = _rms_energy(y)
+            zcr = _zero_crossing_rate(y)
             
             # Compile results
             analysis_result = {
-                'tempo': float(tempo),
-                'beats': beat_times.tolist(),
+                'tempo': tempo,
+                'beats': list(beat_times),
                 'duration': float(duration),
                 'sample_rate': int(sr),
-                'rms_energy': float(np.mean(rms)),
-                'zero_crossing_rate': float(np.mean(zcr)),
+                'rms_energy': rms,
+                'zero_crossing_rate': zcr,
                 'num_beats': len(beat_times)
             }
             
@@ -89,7 +144,8 @@ class AudioAnalyzer:
                 print(f"  Duration: {duration:.2f} seconds")
                 print(f"  Beats detected: {len(beat_times)}")
             
-            return analysis_result
+            self._store_result(key, 'analysis', analysis_result)
+            return _copy_analysis(analysis_result)
             
         except Exception as e:
             if Config.is_debug():
@@ -106,23 +162,17 @@ class AudioAnalyzer:
         Returns:
             Tempo in beats per minute
         """
-        if not LIBROSA_AVAILABLE:
-            return 0.0
-        
-        if not file_path or not os.path.exists(file_path):
+        key = self._validate(file_path)
+        if key is None:
             return 0.0
         
         try:
-            # Load audio file
-            y, sr = librosa.load(file_path)
-            
-            # Extract tempo
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+            tempo, _ = self._track_beats(key)
             
             if Config.is_debug():
                 print(f"Tempo detected: {tempo:.1f} BPM")
             
-            return float(tempo)
+            return tempo
             
         except Exception as e:
             if Config.is_debug():
@@ -139,26 +189,17 @@ class AudioAnalyzer:
         Returns:
             List of beat times in seconds
         """
-        if not LIBROSA_AVAILABLE:
-            return []
-        
-        if not file_path or not os.path.exists(file_path):
+        key = self._validate(file_path)
+        if key is None:
             return []
         
         try:
-            # Load audio file
-            y, sr = librosa.load(file_path)
-            
-            # Extract beats
-            _, beats = librosa.beat.beat_track(y=y, sr=sr)
-            
-            # Convert to time
-            beat_times = librosa.frames_to_time(beats, sr=sr)
+            _, beat_times = self._track_beats(key)
             
             if Config.is_debug():
                 print(f"Beats detected: {len(beat_times)}")
             
-            return beat_times.tolist()
+            return list(beat_times)
             
         except Exception as e:
             if Config.is_debug():
@@ -169,48 +210,244 @@ class AudioAnalyzer:
         """
         Extract various audio features
         
+        Files of STREAM_MIN_DURATION seconds or more are read in blocks with
+        librosa.stream. Each block is resampled on its own, so the streamed
+        features can differ slightly from a full load at block edges.
+        
         Args:
             file_path: Path to audio file
             
         Returns:
             Dictionary of audio features
         """
-        if not LIBROSA_AVAILABLE:
-            return {}
-        
-        if not file_path or not os.path.exists(file_path):
+        key = self._validate(file_path)
+        if key is None:
             return {}
         
         try:
-            # Load audio file
-            y, sr = librosa.load(file_path)
+            cached = self._result_cache.get(key, {})
+            if 'features' in cached:
+                return dict(cached['features'])
             
-            # Basic properties
-            duration = len(y) / sr
+            librosa = _librosa()
             
-            # Audio features
-            rms = librosa.feature.rms(y=y)
-            zcr = librosa.feature.zero_crossing_rate(y)
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)
+            # Stream long files unless they are already decoded
+            features = None
+            if key not in self._load_cache:
+                try:
+                    if librosa.get_duration(path=file_path) >= self.STREAM_MIN_DURATION:
+                        features = self._stream_audio_features(file_path)
+                except Exception as e:
+                    # Formats soundfile cannot probe or stream fall back to a full load
+                    if Config.is_debug():
+                        print(f"Streaming failed for {file_path}, loading fully: {e}")
             
-            features = {
-                'duration': float(duration),
-                'sample_rate': int(sr),
-                'rms_energy': float(np.mean(rms)),
-                'zero_crossing_rate': float(np.mean(zcr)),
-                'spectral_centroid': float(np.mean(spectral_centroids))
-            }
+            if features is None:
+                # Load audio file
+                y, sr = self._load_audio(key)
+                
+                # Basic properties
+                duration = len(y) / sr
+                
+                # Audio features
+                rms = _rms_energy(y)
+                zcr = _zero_crossing_rate(y)
+                spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)
+                
+                features = {
+                    'duration': float(duration),
+                    'sample_rate': int(sr),
+                    'rms_energy': rms,
+                    'zero_crossing_rate': zcr,
+                    'spectral_centroid': float(np.mean(spectral_centroids))
+                }
             
             if Config.is_debug():
                 print(f"Audio features extracted for {file_path}")
             
-            return features
+            self._store_result(key, 'features', features)
+            return dict(features)
             
         except Exception as e:
             if Config.is_debug():
                 print(f"Error extracting features from {file_path}: {e}")
             return {}
     
+    def _stream_audio_features(self, file_path: str) -> Dict[str, Any]:
+        """
+        Extract audio features without decoding the whole file at once
+        
+        Blocks are resampled to the analysis rate and the feature means are
+        accumulated across blocks, so results match get_audio_features on a
+        fully loaded file up to block-edge effects.
+        
+        Args:
+            file_path: Path to audio file
+            
+        Returns:
+            Dictionary of audio features
+        """
+        librosa = _librosa()
+        native_sr = librosa.get_samplerate(file_path)
+        sr = self.ANALYSIS_SAMPLE_RATE
+        
+        # frame_length == hop_length yields non-overlapping blocks
+        stream = librosa.stream(
+            file_path,
+            block_length=self.STREAM_BLOCK_FRAMES,
+            frame_length=self.STREAM_FRAME_LENGTH,
+            hop_length=self.STREAM_FRAME_LENGTH,
+            mono=True
+        )
+        
+        n_samples = 0
+        sum_sq = 0.0
+        crossings = 0
+        last_sign = None
+        centroid_sum = 0.0
+        n_centroid_frames = 0
+        
+        for block in stream:
+            if native_sr != sr:
+                block = librosa.resample(
+                    block, orig_sr=native_sr, target_sr=sr, res_type=self.RESAMPLE_TYPE
+                )
+            if block.size == 0:
+                continue
+            
+            block32 = block.astype(np.float32, copy=False)
+            sum_sq += float(np.dot(block32, block32))
+            
+            # Count sign changes, including the one across the block boundary
+            signs = np.signbit(block)
+            crossings += int(np.count_nonzero(np.diff(signs)))
+            if last_sign is not None and signs[0] != last_sign:
+                crossings += 1
+            last_sign = signs[-1]
+            
+            n_samples += block.size
+            
+            # Uncentered frames avoid padding artifacts at block edges; a
+            # trailing block shorter than one FFT window is skipped
+            if block.size >= self.CENTROID_N_FFT:
+                centroids = librosa.feature.spectral_centroid(
+                    y=block, sr=sr, n_fft=self.CENTROID_N_FFT, center=False
+                )
+                centroid_sum += float(np.sum(centroids))
+                n_centroid_frames += centroids.shape[-1]
+        
+        return {
+            'duration': float(n_samples / sr),
+            'sample_rate': int(sr),
+            'rms_energy': float(np.sqrt(sum_sq / n_samples)) if n_samples else 0.0,
+            'zero_crossing_rate': crossings / (n_samples - 1) if n_samples > 1 else 0.0,
+            'spectral_centroid': centroid_sum / n_centroid_frames if n_centroid_frames else 0.0
+        }
+    
+    def _track_beats(self, key: Tuple[str, float, int]) -> Tuple[float, List[float]]:
+        """
+        Run beat tracking once per file
+        
+        analyze_audio, get_tempo and get_beats all read tempo and beats from
+        this one beat_track call, so they always agree.
+        
+        Args:
+            key: Cache key from _validate
+            
+        Returns:
+            Tempo in beats per minute and beat times in seconds
+        """
+        cached = self._result_cache.get(key, {})
+        if 'beat_track' in cached:
+            return cached['beat_track']
+        
+        librosa = _librosa()
+        y, sr = self._load_audio(key)
+        
+        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+        tempo, beats = librosa.beat.beat_track(onset_envelope=onset_env, sr=sr)
+        beat_times = librosa.frames_to_time(beats, sr=sr)
+        
+        result = (float(tempo), beat_times.tolist())
+        self._store_result(key, 'beat_track', result)
+        return result
+    
+    def _validate(self, file_path: str) -> Optional[Tuple[str, float, int]]:
+        """
+        Check that analysis can run on a file
+        
+        A single stat both confirms the file exists and yields the cache key.
+        
+        Args:
+            file_path: Path to audio file
+            
+        Returns:
+            Cache key (path, mtime, size), or None if analysis is unavailable
+        """
+        if not LIBROSA_AVAILABLE:
+            if Config.is_debug():
+                print("Audio analysis not available - librosa not installed")
+            return None
+        
+        try:
+            st = os.stat(file_path) if file_path else None
+        except OSError:
+            st = None
+        
+        if st is None:
+            if Config.is_debug():
+                print(f"Audio file not found: {file_path}")
+            return None
+        
+        return (file_path, st.st_mtime, st.st_size)
+    
+    def _store_result(self, key: Tuple[str, float, int], name: str, value: Any) -> None:
+        """
+        Remember an analysis result for a file
+        
+        Args:
+            key: Cache key from _validate
+            name: Result name ('analysis', 'beat_track', 'features')
+            value: Result to store
+        """
+        entry = self._result_cache.get(key)
+        if entry is None:
+            if len(self._result_cache) >= self.LOAD_CACHE_SIZE:
+                self._result_cache.pop(next(iter(self._result_cache)))
+            entry = self._result_cache[key] = {}
+        entry[name] = value
+    
+    def _load_audio(self, key: Tuple[str, float, int]) -> Tuple[np.ndarray, int]:
+        """
+        Load audio file, reusing a previous decode of the same file
+        
+        Args:
+            key: Cache key from _validate
+            
+        Returns:
+            Tuple of (samples, sample_rate)
+        """
+        cached = self._load_cache.pop(key, None)
+        if cached is None:
+            cached = _librosa().load(
+                key[0],
+                sr=self.ANALYSIS_SAMPLE_RATE,
+                mono=True,
+                res_type=self.RESAMPLE_TYPE
+            )
+            # Evict least recently used entry
+            if len(self._load_cache) >= self.LOAD_CACHE_SIZE:
+                self._load_cache.pop(next(iter(self._load_cache)))
+        
+        # Re-insert to mark as most recently used
+        self._load_cache[key] = cached
+        return cached
+    
+    def clear_cache(self) -> None:
+        """Discard all cached audio data and analysis results"""
+        self._load_cache.clear()
+        self._result_cache.clear()
+    
     def is_available(self) -> bool:
         """Check if audio analysis is available"""
         return LIBROSA_AVAILABLE
@@ -3,15 +3,35 @@ AudioManager - Audio playback and timing management
 """
 import pygame
 import os
-import sys
 import time
-from typing import Optional
+import importlib.util
+from typing import Optional, Union
 
-# Add src to path for imports (must be before local imports)
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from utils.config import Config
 
-# Local imports after path setup
-from utils.config import Config  # noqa: E402
+# soundfile reads durations from the file header without decoding
+SOUNDFILE_AVAILABLE = importlib.util.find_spec("soundfile") is not None
+
+
+class _MusicStream:
+    """pygame.mixer.music behind the part of the Sound interface AudioManager uses"""
+    
+    def __init__(self, file_path: str, length_seconds: float):
+        """Load a file for streamed playback"""
+        pygame.mixer.music.load(file_path)
+        self._length_seconds = length_seconds
+    
+    def play(self) -> None:
+        """Start streaming from the beginning"""
+        pygame.mixer.music.play()
+    
+    def set_volume(self, volume: float) -> None:
+        """Set stream volume (0.0 - 1.0)"""
+        pygame.mixer.music.set_volume(volume)
+    
+    def get_length(self) -> float:
+        """Get track length in seconds, as read from the file header"""
+        return self._length_seconds
 
 
 class AudioManager:
@@ -25,61 +45,127 @@ class AudioManager:
         '.flac': 'FLAC Audio'
     }
     
-    def __init__(self, buffer_size: Optional[int] = None):
-        """Initialize the audio manager"""
-        self.buffer_size = buffer_size or Config.AUDIO_BUFFER_SIZE
+    # Tracks at least this long are streamed from disk via pygame.mixer.music
+    # instead of being decoded into memory as a Sound
+    STREAM_MIN_DURATION_MS = 10000.0
+    
+    # How often is_playing asks the mixer whether the track has ended
+    BUSY_CHECK_INTERVAL_MS = 100
+    
+    def __init__(self, buffer_size: Optional[int] = None,
+                 frequency: Optional[int] = None,
+                 channels: Optional[int] = None,
+                 sample_size: Optional[int] = None):
+        """
+        Initialize the audio manager
         
-        # Initialize pygame mixer if not already initialized
-        if not pygame.mixer.get_init():
-            pygame.mixer.pre_init(buffer=self.buffer_size)
-            pygame.mixer.init()
+        The buffer size trades hit-sync latency against CPU: the default 1024
+        samples at 44100 Hz is about 23 ms of output latency, 512 is about
+        11 ms. Smaller buffers wake the mixer more often and cost more CPU.
+        
+        Args:
+            buffer_size: Mixer buffer in samples (default Config.AUDIO_BUFFER_SIZE)
+            frequency: Output sample rate in Hz (default Config.AUDIO_FREQUENCY)
+            channels: Output channel count (default Config.AUDIO_CHANNELS)
+            sample_size: Sample format in bits, negative for signed
+                (default Config.AUDIO_SAMPLE_SIZE)
+        """
+        self.buffer_size = buffer_size or Config.AUDIO_BUFFER_SIZE
+        self.frequency = frequency or Config.AUDIO_FREQUENCY
+        self.channels = channels or Config.AUDIO_CHANNELS
+        self.sample_size = sample_size or Config.AUDIO_SAMPLE_SIZE
         
         # Audio state
-        self.current_music: Optional[pygame.mixer.Sound] = None
+        self.current_music: Optional[Union[pygame.mixer.Sound, _MusicStream]] = None
         self.current_file_path: str = ""
+        self._duration_ms: Optional[float] = None
         self.start_time: float = 0
         self.pause_time: float = 0
         self.is_paused: bool = False
         self.volume: float = 1.0
         
-        # Use system time as fallback for testing
-        self._use_system_time = False
+        # Playback flag set on state transitions; the mixer is only polled
+        # every BUSY_CHECK_INTERVAL_MS to notice the track ending by itself
+        self._playing: bool = False
+        self._last_busy_check: float = 0
+        
+        # Time between a sample being mixed and being heard, set with the mixer
+        self._output_latency_ms: float = 0.0
+        
+        # Clock used by _get_time; swapped for system time if pygame's
+        # timer is not running (e.g. no display initialized in tests)
+        self._clock = pygame.time.get_ticks
         
         # Debug info
         if Config.is_debug():
-            print(f"AudioManager initialized - Buffer: {self.buffer_size}")
+            print(
+                f"AudioManager initialized - Buffer: {self.buffer_size}, "
+                f"Frequency: {self.frequency}, Channels: {self.channels}"
+            )
     
     def _get_time(self) -> float:
         """Get current time in milliseconds"""
-        if self._use_system_time:
-            return time.time() * 1000
-        else:
-            pygame_time = pygame.time.get_ticks()
-            if pygame_time == 0:
-                # Fallback to system time if pygame time is not working
-                self._use_system_time = True
-                return time.time() * 1000
-            return float(pygame_time)
+        now = self._clock()
+        if now == 0:
+            # Fallback to system time if pygame time is not working
+            self._clock = self._system_time
+            now = self._clock()
+        return now
+    
+    @staticmethod
+    def _system_time() -> float:
+        """Monotonic system clock in milliseconds"""
+        return time.perf_counter() * 1000
+    
+    def _ensure_mixer(self) -> None:
+        """
+        Initialize pygame mixer if not already initialized
+        
+        Called on first load rather than in __init__: an open mixer keeps an
+        audio thread running even when nothing is playing.
+        """
+        if not pygame.mixer.get_init():
+            pygame.mixer.pre_init(
+                frequency=self.frequency,
+                size=self.sample_size,
+                channels=self.channels,
+                buffer=self.buffer_size
+            )
+            pygame.mixer.init()
+        
+        # One mixer buffer of audio is queued ahead of what is audible
+        frequency = pygame.mixer.get_init()[0]
+        self._output_latency_ms = self.buffer_size * 1000.0 / frequency
     
     def load_music(self, file_path: str) -> bool:
         """Load music file for playback"""
-        if not file_path or not os.path.exists(file_path):
+        try:
+            os.stat(file_path)
+        except (OSError, TypeError, ValueError):
             if Config.is_debug():
                 print(f"Audio file not found: {file_path}")
             return False
         
         # Check if format is supported
-        if not self.is_supported_format(file_path):
+        _, ext = os.path.splitext(file_path.lower())
+        format_info = self.SUPPORTED_FORMATS.get(ext)
+        if format_info is None:
             if Config.is_debug():
-                print(f"Unsupported audio format: {self.get_format_info(file_path)}")
+                print(f"Unsupported audio format: Unknown format ({ext})")
             return False
         
         try:
+            self._ensure_mixer()
+            
             # Stop current music if playing
             self.stop_music()
             
-            # Load new music file
-            self.current_music = pygame.mixer.Sound(file_path)
+            # Load new music file; long tracks stream instead of decoding up front
+            self._duration_ms = self._read_duration(file_path)
+            if self._duration_ms is not None and self._duration_ms >= self.STREAM_MIN_DURATION_MS:
+                self.current_music = _MusicStream(file_path, self._duration_ms / 1000.0)
+            else:
+                self.current_music = pygame.mixer.Sound(file_path)
             self.current_file_path = file_path
             
             # Set volume
@@ -87,7 +173,7 @@ class AudioManager:
                 self.current_music.set_volume(self.volume)
             
             if Config.is_debug():
-                print(f"Loaded audio file: {file_path} ({self.get_format_info(file_path)})")
+                print(f"Loaded audio file: {file_path} ({format_info})")
             
             return True
             
@@ -96,6 +182,7 @@ class AudioManager:
                 print(f"Failed to load audio file {file_path}: {e}")
             self.current_music = None
             self.current_file_path = ""
+            self._duration_ms = None
             return False
     
     def play_music(self) -> None:
@@ -108,11 +195,14 @@ class AudioManager:
         try:
             # Stop any currently playing music
             pygame.mixer.stop()
+            pygame.mixer.music.stop()
             
             # Start playback
             self.current_music.play()
             self.start_time = self._get_time()
             self.is_paused = False
+            self._playing = True
+            self._last_busy_check = self.start_time
             
             if Config.is_debug():
                 print(f"Music playback started at time: {self.start_time}")
@@ -124,10 +214,13 @@ class AudioManager:
     def stop_music(self) -> None:
         """Stop music playback"""
         try:
-            pygame.mixer.stop()
+            if pygame.mixer.get_init():
+                pygame.mixer.stop()
+                pygame.mixer.music.stop()
             self.start_time = 0
             self.pause_time = 0
             self.is_paused = False
+            self._playing = False
             
             if Config.is_debug():
                 print("Music playback stopped")
@@ -143,6 +236,7 @@ class AudioManager:
         
         try:
             pygame.mixer.pause()
+            pygame.mixer.music.pause()
             self.pause_time = self._get_time()
             self.is_paused = True
             
@@ -160,6 +254,7 @@ class AudioManager:
         
         try:
             pygame.mixer.unpause()
+            pygame.mixer.music.unpause()
             
             # Adjust start time to account for pause duration
             if self.pause_time > 0:
@@ -179,7 +274,12 @@ class AudioManager:
     def set_volume(self, volume: float) -> None:
         """Set playback volume (0.0 - 1.0)"""
         # Clamp volume to valid range
-        self.volume = max(0.0, min(1.0, volume))
+        volume = max(0.0, min(1.0, volume))
+        
+        # Loaded music already carries the current volume (see load_music)
+        if volume == self.volume:
+            return
+        self.volume = volume
         
         # Apply to current music if loaded
         if self.current_music:
@@ -193,6 +293,13 @@ class AudioManager:
         if not self.is_playing() and not self.is_paused:
             return 0.0
         
+        if isinstance(self.current_music, _MusicStream):
+            # Streamed tracks follow the audio clock, which also stops while
+            # paused, minus what is still queued in the output buffer
+            position = pygame.mixer.music.get_pos()
+            if position >= 0:
+                return max(0.0, position - self._output_latency_ms)
+        
         if self.is_paused:
             return float(self.pause_time - self.start_time)
         
@@ -203,6 +310,9 @@ class AudioManager:
         if not self.current_music:
             return 0.0
         
+        if self._duration_ms is not None:
+            return self._duration_ms
+        
         try:
             # pygame.mixer.Sound.get_length() returns seconds
             duration_seconds = self.current_music.get_length()
@@ -210,12 +320,34 @@ class AudioManager:
         except:
             return 0.0
     
+    def _read_duration(self, file_path: str) -> Optional[float]:
+        """Read duration in milliseconds from the file header, if possible"""
+        if not SOUNDFILE_AVAILABLE:
+            return None
+        
+        try:
+            import soundfile
+            return soundfile.info(file_path).duration * 1000.0
+        except Exception:
+            # Format not readable by libsndfile; get_duration falls back
+            return None
+    
     def is_playing(self) -> bool:
         """Check if music is currently playing"""
-        try:
-            return pygame.mixer.get_busy() and not self.is_paused
-        except:
+        if not self._playing or self.is_paused:
             return False
+        
+        now = self._get_time()
+        if now - self._last_busy_check > self.BUSY_CHECK_INTERVAL_MS:
+            self._last_busy_check = now
+            try:
+                self._playing = bool(
+                    pygame.mixer.get_busy() or pygame.mixer.music.get_busy()
+                )
+            except pygame.error:
+                self._playing = False
+        
+        return self._playing
     
     def cleanup(self) -> None:
         """Clean up audio resources"""
@@ -223,6 +355,7 @@ class AudioManager:
             self.stop_music()
             self.current_music = None
             self.current_file_path = ""
+            self._duration_ms = None
             self.start_time = 0
             self.pause_time = 0
             self.is_paused = False
@@ -3,28 +3,53 @@ GameManager - Core game state management and main game loop
 """
 
 import pygame
-import sys
 import os
 
-# Add src to path for imports (must be before local imports)
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-# Local imports after path setup
-from utils.config import Config  # noqa: E402
-from audio.audio_manager import AudioManager  # noqa: E402
-from audio.audio_analyzer import AudioAnalyzer  # noqa: E402
-from core.rhythm_engine import RhythmEngine  # noqa: E402
-from ui.ui_renderer import UIRenderer  # noqa: E402
+from utils.config import Config
+from audio.audio_manager import AudioManager
+from audio.audio_analyzer import AudioAnalyzer
+from core.rhythm_engine import RhythmEngine
+from ui.ui_renderer import UIRenderer
 
 
 class GameManager:
     """Manages the main game loop and core game state"""
 
+    # Events after which the window contents must be redrawn in full
+    REDRAW_EVENTS = frozenset((
+        pygame.VIDEOEXPOSE,
+        pygame.WINDOWEXPOSED,
+        pygame.WINDOWRESTORED,
+        pygame.WINDOWSIZECHANGED,
+    ))
+
+    # Event types the game reacts to; everything else is kept off the queue
+    HANDLED_EVENTS = [pygame.QUIT, pygame.KEYDOWN, *REDRAW_EVENTS]
+
+    # Rendered debug text surfaces kept between frames
+    DEBUG_TEXT_CACHE_SIZE = 32
+
+    # Step of the debug time readout; coarser steps reuse the rendered line
+    DEBUG_TIME_STEP_MS = 100
+
+    # Fixed tail of the debug overlay
+    DEBUG_CONTROL_LINES = (
+        "",
+        "Controls:",
+        "  SPACE: Hit notes (in rhythm mode) / Toggle audio",
+        "  ESC: Exit rhythm mode / Quit game",
+    )
+
     def __init__(self):
         """Initialize the game manager"""
+        # Set before anything can raise so cleanup() can always check it
+        self.audio_manager = None
+
         # Initialize pygame
         pygame.init()
-        pygame.mixer.init(buffer=Config.AUDIO_BUFFER_SIZE)
+        # pygame.init() also opens the mixer; close it until AudioManager
+        # loads music so no audio thread runs while nothing is loaded
+        pygame.mixer.quit()
 
         # Create game window
         self.screen = pygame.display.set_mode(Config.get_window_size())
@@ -50,6 +75,32 @@ class GameManager:
         # Game mode
         self.in_rhythm_mode = False
 
+        # UI state handed to UIRenderer.render_frame, reused every frame
+        self._ui_state = {
+            'notes': [],
+            'current_time': 0.0,
+            'score': 0,
+            'combo': 0,
+            'multiplier': 1.0,
+            'last_judgment': None,
+            'music_name': self.current_music_name,
+            'progress': 0.0,
+            'paused': False
+        }
+
+        # Text lines of the last menu frame drawn; None forces a redraw
+        self._menu_frame = None
+
+        # KEYDOWN handlers by key; each takes the frame's playback time
+        self._key_handlers = {
+            pygame.K_SPACE: self._on_space,
+            pygame.K_ESCAPE: self._on_escape,
+        }
+
+        # Debug overlay font and rendered lines, created on first use
+        self._debug_font = None
+        self._debug_text_cache = {}
+
         # Debug info
         if Config.is_debug():
             print(
@@ -65,28 +116,45 @@ class GameManager:
             print("Starting game loop...")
             print(f"Initial rhythm mode: {self.in_rhythm_mode}")
 
+        # Blocked events are dropped by SDL before they reach Python
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(self.HANDLED_EVENTS)
+
+        # Bind per-frame callables once; the loop body then uses fast locals
+        handle_events = self.handle_events
+        update = self.update
+        render = self.render
+        clock_tick = self.clock.tick
+        target_fps = Config.TARGET_FPS
+        get_current_time = self.audio_manager.get_current_time
+        debug = Config.is_debug()  # Boot-time flag; fixed for the whole loop
+
         try:
             frame_count = 0
+            dt = 0  # Duration of the previous frame in ms, as returned by tick
             while self.running:
+                # Sample the playback clock once so input, update and render agree
+                now = get_current_time() if self.in_rhythm_mode else None
+
                 # Handle events
-                space_pressed = self.handle_events()
+                space_pressed = handle_events(now)
 
                 # Update game state
-                self.update()
+                update(now, dt)
 
                 # Render frame
-                self.render()
+                render(now)
 
                 # Maintain target FPS
-                self.tick()
+                dt = clock_tick(target_fps)
 
                 # Debug: Log first few frames
                 frame_count += 1
-                if Config.is_debug() and frame_count <= 5:
+                if debug and frame_count <= 5:
                     print(f"Frame {frame_count}: running={self.running}, rhythm_mode={self.in_rhythm_mode}")
 
                 # Debug: Log space key presses
-                if space_pressed and Config.is_debug() and not self.in_rhythm_mode:
+                if space_pressed and debug and not self.in_rhythm_mode:
                     print("Space key pressed!")
 
         except Exception as e:
@@ -98,122 +166,186 @@ class GameManager:
                 print("Game loop ended")
             self.cleanup()
 
-    def handle_events(self) -> bool:
-        """Handle pygame events"""
+    def handle_events(self, now: float = None) -> bool:
+        """
+        Handle pygame events
+
+        Args:
+            now: Playback time for this frame in ms (queried if not given)
+
+        Returns:
+            True if space was pressed
+        """
         space_pressed = False
+        QUIT, KEYDOWN, K_SPACE = pygame.QUIT, pygame.KEYDOWN, pygame.K_SPACE
+        key_handlers = self._key_handlers
+        redraw_events = self.REDRAW_EVENTS
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        for event in pygame.event.get(self.HANDLED_EVENTS):
+            event_type = event.type
+            if event_type == QUIT:
                 self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE:
+            elif event_type == KEYDOWN:
+                key = event.key
+                handler = key_handlers.get(key)
+                if handler:
+                    handler(now)
+                if key == K_SPACE:
                     space_pressed = True
-                    if self.in_rhythm_mode:
-                        # Handle rhythm game input
-                        current_time = self.audio_manager.get_current_time()
-                        result = self.rhythm_engine.process_input(current_time)
-                        if result:
-                            self.last_judgment_result = result
-                            self.ui_renderer.add_judgment_feedback(result)
-                    else:
-                        # Toggle audio playback
-                        if self.audio_manager.current_music:
-                            if self.audio_manager.is_playing():
-                                self.audio_manager.pause_music()
-                                self.paused = True
-                                if Config.is_debug():
-                                    print("Audio paused")
-                            else:
-                                if self.audio_manager.is_paused:
-                                    self.audio_manager.resume_music()
-                                    self.paused = False
-                                    if Config.is_debug():
-                                        print("Audio resumed")
-                                else:
-                                    self.audio_manager.play_music()
-                                    self.paused = False
-                                    if Config.is_debug():
-                                        print("Audio started")
-                elif event.key == pygame.K_ESCAPE:
-                    if self.in_rhythm_mode:
-                        # Exit rhythm mode
-                        self.end_rhythm_game()
-                    else:
-                        self.running = False
+            elif event_type in redraw_events:
+                # The window was exposed or resized; skipped frames are stale
+                self._menu_frame = None
+                self.ui_renderer.invalidate()
 
         return space_pressed
 
-    def update(self) -> None:
-        """Update game state"""
+    def _on_space(self, now: float = None) -> None:
+        """Hit notes in rhythm mode, otherwise toggle audio playback"""
+        if self.in_rhythm_mode:
+            # Handle rhythm game input
+            current_time = now if now is not None else self.audio_manager.get_current_time()
+            result = self.rhythm_engine.process_input(current_time)
+            if result:
+                self.last_judgment_result = result
+                self.ui_renderer.add_judgment_feedback(result)
+            return
+
+        # Toggle audio playback
+        if not self.audio_manager.current_music:
+            return
+
+        if self.audio_manager.is_playing():
+            self.audio_manager.pause_music()
+            self.paused = True
+            if Config.is_debug():
+                print("Audio paused")
+        elif self.audio_manager.is_paused:
+            self.audio_manager.resume_music()
+            self.paused = False
+            if Config.is_debug():
+                print("Audio resumed")
+        else:
+            self.audio_manager.play_music()
+            self.paused = False
+            if Config.is_debug():
+                print("Audio started")
+
+    def _on_escape(self, now: float = None) -> None:
+        """Exit rhythm mode, or quit from the menu"""
+        if self.in_rhythm_mode:
+            self.end_rhythm_game()
+        else:
+            self.running = False
+
+    def update(self, now: float = None, dt: int = None) -> None:
+        """
+        Update game state
+
+        Args:
+            now: Playback time for this frame in ms (queried if not given)
+            dt: Previous frame duration in ms (read from the clock if not given)
+        """
         if self.in_rhythm_mode:
             # Update rhythm game
-            current_time = self.audio_manager.get_current_time()
+            current_time = now if now is not None else self.audio_manager.get_current_time()
             self.rhythm_engine.update(current_time)
             
             # Update UI renderer
-            dt = self.clock.get_time()  # デルタタイム（ミリ秒）
+            if dt is None:
+                dt = self.clock.get_time()  # デルタタイム（ミリ秒）
             self.ui_renderer.update(dt)
 
-    def render(self) -> None:
-        """Render the current frame"""
+    def render(self, now: float = None) -> None:
+        """
+        Render the current frame
+
+        Args:
+            now: Playback time for this frame in ms (queried if not given)
+        """
         if self.in_rhythm_mode:
             # Render rhythm game
-            self.render_rhythm_game()
+            self.render_rhythm_game(now)
         else:
             # Render menu/debug mode
-            self.render_menu_mode()
             # Update display (only in menu mode, rhythm mode handles its own display update)
-            pygame.display.flip()
+            if self.render_menu_mode():
+                pygame.display.flip()
 
-    def render_rhythm_game(self) -> None:
-        """Render rhythm game mode"""
+    def render_rhythm_game(self, now: float = None) -> None:
+        """
+        Render rhythm game mode
+
+        Args:
+            now: Playback time for this frame in ms (queried if not given)
+        """
         # Get current game state
-        current_time = self.audio_manager.get_current_time()
+        current_time = now if now is not None else self.audio_manager.get_current_time()
         active_notes = self.rhythm_engine.get_active_notes(current_time)
         
         # Calculate music progress
-        audio_info = self.audio_manager.get_audio_info()
-        duration = audio_info.get('duration_ms', 1)
+        duration = self.audio_manager.get_duration()
         progress = current_time / duration if duration > 0 else 0.0
         
-        # Create UI state dictionary
-        ui_state = {
-            'notes': active_notes,
-            'current_time': current_time,
-            'score': self.rhythm_engine.get_score(),
-            'combo': self.rhythm_engine.get_combo(),
-            'multiplier': self.rhythm_engine._get_combo_multiplier(),
-            'last_judgment': self.last_judgment_result,
-            'music_name': self.current_music_name,
-            'progress': progress,
-            'paused': self.paused
-        }
+        # Fill the persistent UI state in place; render_frame only reads it
+        ui_state = self._ui_state
+        ui_state['notes'] = active_notes
+        ui_state['current_time'] = current_time
+        ui_state['score'] = self.rhythm_engine.get_score()
+        ui_state['combo'] = self.rhythm_engine.get_combo()
+        ui_state['multiplier'] = self.rhythm_engine._get_combo_multiplier()
+        ui_state['last_judgment'] = self.last_judgment_result
+        ui_state['music_name'] = self.current_music_name
+        ui_state['progress'] = progress
+        ui_state['paused'] = self.paused
         
         # Render complete frame
         self.ui_renderer.render_frame(ui_state)
 
-    def render_menu_mode(self) -> None:
-        """Render menu/debug mode"""
+    def render_menu_mode(self) -> bool:
+        """
+        Render menu/debug mode
+
+        Returns:
+            True if the frame was redrawn, False if it matches the last one
+        """
+        # The menu frame is fully determined by its text lines
+        info_lines = self._debug_info_lines() if Config.is_debug() else []
+        if info_lines == self._menu_frame:
+            return False
+        self._menu_frame = info_lines
+
         # Clear screen with black background
         self.screen.fill((0, 0, 0))
 
         # Render audio info if available
-        if Config.is_debug():
-            self._render_debug_info()
+        if info_lines:
+            self._render_debug_info(info_lines)
+        return True
 
-    def _render_debug_info(self) -> None:
+    def _render_debug_info(self, info_lines=None) -> None:
         """Render debug information"""
-        font = pygame.font.Font(None, 24)
+        if info_lines is None:
+            info_lines = self._debug_info_lines()
+
         y_offset = 10
+        for line in info_lines:
+            if line:  # Skip empty lines
+                self.screen.blit(self._render_debug_text(line), (10, y_offset))
+            y_offset += 25
 
+    def _debug_info_lines(self) -> list:
+        """Build the debug information text lines"""
         info_lines = []
         
         # Audio info
         if self.audio_manager.current_music:
             audio_info = self.audio_manager.get_audio_info()
+            # Quantized so the line only re-renders every DEBUG_TIME_STEP_MS
+            step = self.DEBUG_TIME_STEP_MS
+            shown_time = audio_info.get('current_time_ms', 0) // step * step
             info_lines.extend([
-                f"Audio: {os.path.basename(audio_info.get('file_path', 'None'))}",
-                f"Time: {audio_info.get('current_time_ms', 0):.0f}ms / {audio_info.get('duration_ms', 0):.0f}ms",
+                f"Audio: {self.current_music_name}",
+                f"Time: {shown_time:.0f}ms / {audio_info.get('duration_ms', 0):.0f}ms",
                 f"Playing: {audio_info.get('is_playing', False)}",
                 f"Volume: {audio_info.get('volume', 0):.1f}",
             ])
@@ -225,21 +357,28 @@ class GameManager:
             "",
             f"Rhythm Mode: {self.in_rhythm_mode}",
             f"Notes: {len(self.rhythm_engine.notes) if hasattr(self.rhythm_engine, 'notes') else 0}",
-            "",
-            "Controls:",
-            "  SPACE: Hit notes (in rhythm mode) / Toggle audio",
-            "  ESC: Exit rhythm mode / Quit game"
         ])
-
-        for line in info_lines:
-            if line:  # Skip empty lines
-                text = font.render(line, True, (255, 255, 255))
-                self.screen.blit(text, (10, y_offset))
-            y_offset += 25
-
-    def tick(self) -> None:
-        """Maintain target frame rate"""
-        self.clock.tick(Config.TARGET_FPS)
+        info_lines.extend(self.DEBUG_CONTROL_LINES)
+        return info_lines
+
+    def _render_debug_text(self, line: str) -> pygame.Surface:
+        """Render a debug line, reusing the surface if the text is unchanged"""
+        surface = self._debug_text_cache.pop(line, None)
+        if surface is None:
+            if self._debug_font is None:
+                self._debug_font = pygame.font.Font(None, 24)
+            surface = self._debug_font.render(line, True, (255, 255, 255))
+            # Evict least recently used line
+            if len(self._debug_text_cache) >= self.DEBUG_TEXT_CACHE_SIZE:
+                self._debug_text_cache.pop(next(iter(self._debug_text_cache)))
+
+        # Re-insert to mark as most recently used
+        self._debug_text_cache[line] = surface
+        return surface
+
+    def tick(self) -> int:
+        """Maintain target frame rate, returning the frame duration in ms"""
+        return self.clock.tick(Config.TARGET_FPS)
 
     def cleanup(self) -> None:
         """Clean up resources"""
@@ -247,7 +386,7 @@ class GameManager:
             print("Cleaning up game resources...")
 
         # Cleanup audio
-        if hasattr(self, 'audio_manager'):
+        if self.audio_manager is not None:
             self.audio_manager.cleanup()
 
         pygame.quit()
@@ -306,6 +445,8 @@ class GameManager:
         
         if self.rhythm_engine.start_game(current_file):
             self.in_rhythm_mode = True
+            # The menu was on screen; the first rhythm frame redraws everything
+            self.ui_renderer.invalidate()
             if Config.is_debug():
                 print("Rhythm game mode started")
                 print(f"Notes generated: {len(self.rhythm_engine.notes)}")
@@ -321,6 +462,7 @@ class GameManager:
         if self.in_rhythm_mode:
             results = self.rhythm_engine.end_game()
             self.in_rhythm_mode = False
+            self._menu_frame = None
             if Config.is_debug():
                 print("Rhythm game mode ended")
             return results
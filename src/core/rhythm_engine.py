@@ -2,18 +2,16 @@
 RhythmEngine - Core rhythm game logic and state management
 """
 
-import os
-import sys
-from typing import List, Dict, Any, Optional
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional
 
-# Add src to path for imports (must be before local imports)
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+import numpy as np
 
-# Local imports after path setup
-from utils.config import Config  # noqa: E402
-from gameplay.note import Note  # noqa: E402
-from audio.audio_manager import AudioManager  # noqa: E402
-from audio.audio_analyzer import AudioAnalyzer  # noqa: E402
+from utils.config import Config
+from gameplay.note import Note
+from audio.audio_manager import AudioManager
+from audio.audio_analyzer import AudioAnalyzer
 
 
 class JudgmentResult:
@@ -38,6 +36,16 @@ class JudgmentResult:
 class RhythmEngine:
     """Main rhythm game engine managing gameplay logic"""
 
+    # Base points per judgment
+    SCORE_VALUES = {"perfect": 1000, "good": 500, "miss": 0}
+
+    # Beat times in seconds used when analysis finds no beats:
+    # one note every second for 10 seconds
+    FALLBACK_BEATS = tuple(float(second) for second in range(1, 11))
+
+    # Combo multiplier indexed by combo count; the last entry covers 20+
+    COMBO_MULTIPLIERS = (1.0,) * 10 + (1.1,) * 10 + (1.2,)
+
     def __init__(
         self,
         audio_manager: AudioManager = None,
@@ -45,6 +53,9 @@ class RhythmEngine:
         timing_window: Dict[str, float] = None,
     ):
         """Initialize the rhythm engine"""
+        # Debug mode is a boot-time flag; read it once for the hot paths
+        self._debug = Config.is_debug()
+
         self.audio_manager = audio_manager
         self.audio_analyzer = audio_analyzer
 
@@ -54,8 +65,11 @@ class RhythmEngine:
             "good": 50.0,  # ±50ms
         }
 
+        # Notes are kept sorted by hit_time with a parallel list of times for
+        # bisect; every note before _cursor is judged or otherwise inactive
+        self.notes = []
+
         # Game state
-        self.notes: List[Note] = []
         self.score = 0
         self.combo = 0
         self.max_combo = 0
@@ -72,9 +86,49 @@ class RhythmEngine:
         self.good_hits = 0
         self.misses = 0
 
-        if Config.is_debug():
+        # Statistics update per judgment, dispatched by _update_score_new
+        self._judgment_handlers = {
+            "perfect": self._on_perfect,
+            "good": self._on_good,
+            "miss": self._on_miss,
+        }
+
+        if self._debug:
             print("RhythmEngine initialized")
 
+    @property
+    def timing_window(self) -> Mapping[str, float]:
+        """
+        Timing windows in milliseconds ('perfect', 'good')
+
+        Read-only: the judging thresholds are cached in the setter, so assign
+        a new dict to change them instead of editing this one in place.
+        """
+        return MappingProxyType(self._timing_window)
+
+    @timing_window.setter
+    def timing_window(self, window: Dict[str, float]) -> None:
+        """Set timing windows and cache the thresholds used when judging"""
+        self._timing_window = dict(window)
+        self._perfect_ms = float(window["perfect"])
+        self._good_ms = float(window["good"])
+
+    @property
+    def notes(self) -> List[Note]:
+        """
+        Notes in hit_time order
+
+        Do not append to or reorder this list in place: the bisect index would
+        go stale. Use add_note, or assign a new list to rebuild the index.
+        """
+        return self._notes
+
+    @notes.setter
+    def notes(self, notes: List[Note]) -> None:
+        """Replace all notes and rebuild the hit-time index"""
+        self._notes = list(notes)
+        self._index_notes()
+
     def start_game(self, audio_file: str) -> bool:
         """
         Start a new rhythm game with the given audio file
@@ -85,12 +139,12 @@ class RhythmEngine:
         Returns:
             True if game started successfully
         """
-        if Config.is_debug():
+        if self._debug:
             print(f"Starting game with audio: {audio_file}")
 
         # Load audio
         if not self.audio_manager.load_music(audio_file):
-            if Config.is_debug():
+            if self._debug:
                 print("Failed to load audio file")
             return False
 
@@ -102,7 +156,7 @@ class RhythmEngine:
         self.is_playing = True
         self.game_start_time = 0.0  # Will be set by first update
 
-        if Config.is_debug():
+        if self._debug:
             print(f"Game started with {len(self.notes)} notes")
 
         return True
@@ -113,19 +167,14 @@ class RhythmEngine:
 
         # If no beats detected, generate fallback pattern
         if not beats:
-            if Config.is_debug():
+            if self._debug:
                 print("No beats detected, generating fallback pattern")
-            # Generate simple pattern: one note every second for 10 seconds
-            beats = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+            beats = self.FALLBACK_BEATS
 
-        self.notes = []
-        for beat_time in beats:
-            # Convert beat time from seconds to milliseconds
-            hit_time = beat_time * 1000.0
-            note = Note(hit_time=hit_time, lane=0)
-            self.notes.append(note)
+        # Convert beat time from seconds to milliseconds
+        self.notes = [Note(hit_time=beat_time * 1000.0, lane=0) for beat_time in beats]
 
-        if Config.is_debug():
+        if self._debug:
             print(f"Generated {len(self.notes)} notes from beats")
 
     def update_legacy(self, current_time: float) -> None:
@@ -155,7 +204,7 @@ class RhythmEngine:
 
         # Check if game should end (all notes processed and audio finished)
         if active_notes == 0 and not self.audio_manager.is_playing():
-            if Config.is_debug():
+            if self._debug:
                 print("All notes processed and audio finished")
             # Don't auto-end, let player exit manually
 
@@ -185,7 +234,7 @@ class RhythmEngine:
             # Update score and stats
             self._update_score(judgment)
 
-            if Config.is_debug():
+            if self._debug:
                 print(f"Hit note: {judgment}, Score: {self.score}")
 
     def _update_score(self, judgment: str) -> None:
@@ -251,7 +300,7 @@ class RhythmEngine:
             "max_combo": self.combo,
         }
 
-        if Config.is_debug():
+        if self._debug:
             print(f"Game ended: {results}")
 
         return results
@@ -263,10 +312,29 @@ class RhythmEngine:
         Args:
             note: Note to add
         """
-        self.notes.append(note)
-        if Config.is_debug():
+        index = bisect_right(self._hit_times, note.hit_time)
+        self._hit_times.insert(index, note.hit_time)
+        self.notes.insert(index, note)
+        if index < self._cursor:
+            self._cursor = index
+
+        if self._debug:
             print(f"Added note at time {note.hit_time}ms")
 
+    def _index_notes(self) -> None:
+        """Sort notes by hit time and rebuild the lookup list and cursor"""
+        self._notes.sort(key=lambda note: note.hit_time)
+        self._hit_times = [note.hit_time for note in self._notes]
+        self._cursor = 0
+
+    def _advance_cursor(self) -> None:
+        """Move the cursor past notes that can no longer be judged"""
+        notes = self.notes
+        cursor = self._cursor
+        while cursor < len(notes) and (notes[cursor].is_judged or not notes[cursor].is_active):
+            cursor += 1
+        self._cursor = cursor
+
     def process_input(self, input_time: float = None) -> Optional[JudgmentResult]:
         """
         Process player input and evaluate timing
@@ -283,18 +351,20 @@ class RhythmEngine:
         if input_time is None:
             return None
 
-        # Find the closest hittable note
+        # Find the closest hittable note among those inside the good window
+        good_window = self._good_ms
+        lo = bisect_left(self._hit_times, input_time - good_window, self._cursor)
+        hi = bisect_right(self._hit_times, input_time + good_window, lo)
+
         closest_note = None
         closest_distance = float("inf")
 
-        for note in self.notes:
+        for note in self.notes[lo:hi]:
             if note.is_active and not note.is_judged:
-                # Check if within good timing window
                 timing_diff = abs(input_time - note.hit_time)
-                if timing_diff <= self.timing_window["good"]:
-                    if timing_diff < closest_distance:
-                        closest_distance = timing_diff
-                        closest_note = note
+                if timing_diff < closest_distance:
+                    closest_distance = timing_diff
+                    closest_note = note
 
         if closest_note:
             # Judge the timing
@@ -304,6 +374,7 @@ class RhythmEngine:
             # Mark note as judged
             closest_note.is_judged = True
             closest_note.hit()
+            self._advance_cursor()
 
             # Update score and stats
             self._update_score_new(judgment)
@@ -313,13 +384,46 @@ class RhythmEngine:
             combo_multiplier = self._get_combo_multiplier()
             result = JudgmentResult(judgment, timing_diff, score_gained, combo_multiplier)
 
-            if Config.is_debug():
+            if self._debug:
                 print(f"Processed input: {judgment}, timing_diff={timing_diff:.1f}ms")
 
             return result
 
         return None
 
+    def judge_batch(self, input_times) -> np.ndarray:
+        """
+        Judge many input times at once, e.g. for replays or analytics
+
+        Each input is judged against its nearest note. Notes are not consumed
+        and engine state is left untouched, so results match process_input
+        only while no two inputs compete for the same note.
+
+        Args:
+            input_times: Input times in milliseconds
+
+        Returns:
+            Array of judgment strings ('perfect', 'good', 'miss')
+        """
+        inputs = np.asarray(input_times, dtype=np.float64)
+        if not self._hit_times:
+            return np.full(inputs.shape, "miss")
+
+        hit_times = np.asarray(self._hit_times, dtype=np.float64)
+        last = len(hit_times) - 1
+
+        # Nearest note is either side of the insertion point
+        right = np.searchsorted(hit_times, inputs)
+        left = np.clip(right - 1, 0, last)
+        right = np.clip(right, 0, last)
+        diffs = np.minimum(np.abs(inputs - hit_times[left]), np.abs(inputs - hit_times[right]))
+
+        return np.where(
+            diffs <= self._perfect_ms,
+            "perfect",
+            np.where(diffs <= self._good_ms, "good", "miss"),
+        )
+
     def update(self, current_time: float) -> List[JudgmentResult]:
         """
         Update engine state and process missed notes
@@ -336,14 +440,21 @@ class RhythmEngine:
         # Convert to milliseconds for consistency
         current_time_ms = current_time * 1000
 
+        # Notes before the cutoff are past the good timing window
+        good_window = self._good_ms
+        end = bisect_left(self._hit_times, current_time_ms - good_window, self._cursor)
+
+        # Most frames nothing new has expired
+        if end == self._cursor:
+            return []
+
         miss_results = []
 
         # Check for missed notes
-        for note in self.notes:
+        for note in self.notes[self._cursor:end]:
             if note.is_active and not note.is_judged:
-                # Check if note is missed (past good timing window)
                 time_since_note = current_time_ms - note.hit_time
-                if time_since_note > self.timing_window["good"]:
+                if time_since_note > good_window:
                     # Mark as missed
                     note.is_judged = True
                     note.miss()
@@ -355,9 +466,10 @@ class RhythmEngine:
                     miss_result = JudgmentResult("miss", time_since_note, 0, 1.0)
                     miss_results.append(miss_result)
 
-                    if Config.is_debug():
+                    if self._debug:
                         print(f"Note missed: time_diff={time_since_note:.1f}ms")
 
+        self._advance_cursor()
         return miss_results
 
     def get_score(self) -> int:
@@ -371,6 +483,8 @@ class RhythmEngine:
     def clear(self) -> None:
         """Clear all engine state"""
         self.notes.clear()
+        self._hit_times.clear()
+        self._cursor = 0
         self.score = 0
         self.combo = 0
         self.max_combo = 0
@@ -383,7 +497,7 @@ class RhythmEngine:
         self.good_hits = 0
         self.misses = 0
 
-        if Config.is_debug():
+        if self._debug:
             print("RhythmEngine state cleared")
 
     def _judge_timing(self, timing_diff: float) -> str:
@@ -396,9 +510,9 @@ class RhythmEngine:
         Returns:
             Judgment string: 'perfect', 'good', or 'miss'
         """
-        if timing_diff <= self.timing_window["perfect"]:
+        if timing_diff <= self._perfect_ms:
             return "perfect"
-        elif timing_diff <= self.timing_window["good"]:
+        elif timing_diff <= self._good_ms:
             return "good"
         else:
             return "miss"
@@ -410,41 +524,39 @@ class RhythmEngine:
         Args:
             judgment: Judgment result ('perfect', 'good', 'miss')
         """
-        score_values = {"perfect": 1000, "good": 500, "miss": 0}
-
-        # Calculate combo multiplier
-        combo_multiplier = self._get_combo_multiplier()
-
-        # Calculate points
-        base_points = score_values.get(judgment, 0)
-        points = int(base_points * combo_multiplier)
-        self.score += points
+        # Calculate points with the combo multiplier before this judgment
+        self.score += self._calculate_score_gain(judgment)
 
         # Update combo and stats
-        if judgment == "perfect":
-            self.perfect_count += 1
-            self.perfect_hits += 1  # Legacy compatibility
-            self.combo += 1
-        elif judgment == "good":
-            self.good_count += 1
-            self.good_hits += 1  # Legacy compatibility
-            self.combo += 1
-        elif judgment == "miss":
-            self.miss_count += 1
-            self.misses += 1  # Legacy compatibility
-            self.combo = 0
+        handler = self._judgment_handlers.get(judgment)
+        if handler:
+            handler()
 
         # Update max combo
         self.max_combo = max(self.max_combo, self.combo)
 
+    def _on_perfect(self) -> None:
+        """Record a perfect judgment"""
+        self.perfect_count += 1
+        self.perfect_hits += 1  # Legacy compatibility
+        self.combo += 1
+
+    def _on_good(self) -> None:
+        """Record a good judgment"""
+        self.good_count += 1
+        self.good_hits += 1  # Legacy compatibility
+        self.combo += 1
+
+    def _on_miss(self) -> None:
+        """Record a miss"""
+        self.miss_count += 1
+        self.misses += 1  # Legacy compatibility
+        self.combo = 0
+
     def _get_combo_multiplier(self) -> float:
         """Get combo multiplier based on current combo"""
-        if self.combo < 10:
-            return 1.0
-        elif self.combo < 20:
-            return 1.1
-        else:
-            return 1.2
+        table = self.COMBO_MULTIPLIERS
+        return table[min(self.combo, len(table) - 1)]
 
     def get_active_notes(self, current_time: float) -> List[Note]:
         """
@@ -459,15 +571,11 @@ class RhythmEngine:
         # Show notes within the UI visibility window (2 seconds ahead)
         visibility_window = 2000.0  # ms
         
-        visible_notes = []
-        for note in self.notes:
-            if not note.is_judged:
-                # Show notes that will hit within the next 2 seconds
-                time_to_hit = note.hit_time - current_time
-                if -100 <= time_to_hit <= visibility_window:  # Allow small buffer for past notes
-                    visible_notes.append(note)
+        # Allow small buffer for past notes; only the notes inside the window are visited
+        lo = bisect_left(self._hit_times, current_time - 100)
+        hi = bisect_right(self._hit_times, current_time + visibility_window, lo)
         
-        return visible_notes
+        return [note for note in self.notes[lo:hi] if not note.is_judged]
 
     def _calculate_score_gain(self, judgment: str) -> int:
         """
@@ -479,7 +587,6 @@ class RhythmEngine:
         Returns:
             Score points gained
         """
-        score_values = {"perfect": 1000, "good": 500, "miss": 0}
-        base_points = score_values.get(judgment, 0)
+        base_points = self.SCORE_VALUES.get(judgment, 0)
         combo_multiplier = self._get_combo_multiplier()
         return int(base_points * combo_multiplier)
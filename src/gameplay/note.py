@@ -2,35 +2,54 @@
 Note - Individual rhythm game note representation
 """
 
-import os
-import sys
 from typing import Tuple
 
-# Add src to path for imports (must be before local imports)
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from utils.config import Config
 
-# Local imports after path setup
-from utils.config import Config  # noqa: E402
+# Read once at import; main.py applies --debug before the game modules are imported
+_DEBUG = Config.is_debug()
 
 # Game constants
+NOTE_LANE_X = 400  # Center of screen
+NOTE_LANE_WIDTH = 100
+HIT_ZONE_Y = 500  # Near bottom
+NOTE_SPAWN_Y = -50  # Above screen
+NOTE_SPEED = 300  # pixels per second (default)
+
+PERFECT_WINDOW = 25  # ±25ms (updated for F-03 spec)
+GOOD_WINDOW = 50  # ±50ms (updated for F-03 spec)
+MISS_WINDOW = 100  # >50ms (updated for F-03 spec)
+
+# Dict views of the constants above, kept for existing callers
 GAME_AREA = {
-    "NOTE_LANE_X": 400,  # Center of screen
-    "NOTE_LANE_WIDTH": 100,
-    "HIT_ZONE_Y": 500,  # Near bottom
-    "NOTE_SPAWN_Y": -50,  # Above screen
-    "NOTE_SPEED": 300,  # pixels per second (default)
+    "NOTE_LANE_X": NOTE_LANE_X,
+    "NOTE_LANE_WIDTH": NOTE_LANE_WIDTH,
+    "HIT_ZONE_Y": HIT_ZONE_Y,
+    "NOTE_SPAWN_Y": NOTE_SPAWN_Y,
+    "NOTE_SPEED": NOTE_SPEED,
 }
 
 TIMING_WINDOWS = {
-    "PERFECT": 25,  # ±25ms (updated for F-03 spec)
-    "GOOD": 50,  # ±50ms (updated for F-03 spec)
-    "MISS": 100,  # >50ms (updated for F-03 spec)
+    "PERFECT": PERFECT_WINDOW,
+    "GOOD": GOOD_WINDOW,
+    "MISS": MISS_WINDOW,
 }
 
 
 class Note:
     """Represents a single rhythm game note"""
 
+    # Fixed attribute layout: no per-note __dict__, and a chart holds many notes
+    __slots__ = (
+        "hit_time",
+        "lane",
+        "note_type",
+        "y_position",
+        "is_active",
+        "is_hit",
+        "is_judged",
+    )
+
     def __init__(self, hit_time: float, lane: int = 0, note_type: str = "tap"):
         """
         Initialize a note
@@ -43,12 +62,12 @@ class Note:
         self.hit_time = hit_time
         self.lane = lane
         self.note_type = note_type
-        self.y_position = GAME_AREA["NOTE_SPAWN_Y"]
+        self.y_position = NOTE_SPAWN_Y
         self.is_active = True
         self.is_hit = False
         self.is_judged = False
 
-        if Config.is_debug():
+        if _DEBUG:
             print(f"Note created: hit_time={hit_time}ms, lane={lane}")
 
     def update(self, current_time: float, note_speed: float) -> None:
@@ -67,10 +86,10 @@ class Note:
         time_to_hit = self.hit_time - current_time
 
         # Distance from hit zone (negative means below hit zone)
-        distance_from_hit_zone = (time_to_hit / 1000.0) * note_speed
+        distance_from_hit_zone = time_to_hit * (note_speed * 0.001)
 
         # Calculate Y position (hit zone + distance)
-        self.y_position = GAME_AREA["HIT_ZONE_Y"] - distance_from_hit_zone
+        self.y_position = HIT_ZONE_Y - distance_from_hit_zone
 
     def get_position(self) -> Tuple[int, int]:
         """
@@ -79,7 +98,7 @@ class Note:
         Returns:
             Tuple of (x, y) screen coordinates
         """
-        x = GAME_AREA["NOTE_LANE_X"] + (self.lane * 100)  # Offset for different lanes
+        x = NOTE_LANE_X + (self.lane * NOTE_LANE_WIDTH)  # Offset for different lanes
         y = int(self.y_position)
         return (x, y)
 
@@ -93,8 +112,7 @@ class Note:
         Returns:
             True if note can be hit at current time
         """
-        time_diff = abs(current_time - self.hit_time)
-        return time_diff <= TIMING_WINDOWS["GOOD"]
+        return -GOOD_WINDOW <= current_time - self.hit_time <= GOOD_WINDOW
 
     def is_missed(self, current_time: float) -> bool:
         """
@@ -107,7 +125,7 @@ class Note:
             True if note is past the miss window
         """
         time_diff = current_time - self.hit_time
-        return time_diff > TIMING_WINDOWS["MISS"]
+        return time_diff > MISS_WINDOW
 
     def get_timing_judgment(self, input_time: float) -> str:
         """
@@ -121,9 +139,9 @@ class Note:
         """
         time_diff = abs(input_time - self.hit_time)
 
-        if time_diff <= TIMING_WINDOWS["PERFECT"]:
+        if time_diff <= PERFECT_WINDOW:
             return "PERFECT"
-        elif time_diff <= TIMING_WINDOWS["GOOD"]:
+        elif time_diff <= GOOD_WINDOW:
             return "GOOD"
         else:
             return "MISS"
@@ -133,7 +151,7 @@ class Note:
         self.is_hit = True
         self.is_active = False
 
-        if Config.is_debug():
+        if _DEBUG:
             print(f"Note hit at time {self.hit_time}ms")
 
     def miss(self) -> None:
@@ -141,7 +159,7 @@ class Note:
         self.is_hit = False
         self.is_active = False
 
-        if Config.is_debug():
+        if _DEBUG:
             print(f"Note missed at time {self.hit_time}ms")
 
     def get_info(self) -> dict:
@@ -180,5 +198,4 @@ class Note:
         Returns:
             True if input is within timing window
         """
-        time_diff = abs(input_time - self.hit_time)
-        return time_diff <= window
+        return -window <= input_time - self.hit_time <= window
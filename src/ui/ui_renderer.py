@@ -6,7 +6,7 @@ UI Renderer Module
 """
 
 import pygame
-import math
+from collections import deque
 from typing import List, Dict, Tuple, Optional
 from utils.config import Config
 from gameplay.note import Note
@@ -29,6 +29,13 @@ class UIRenderer:
         'pause_overlay': (0, 0, 0, 128),  # 半透明黒
     }
 
+    # 判定ごとの表示テキストと色（描画時の分岐と文字列生成を省く）
+    JUDGMENT_STYLES = {
+        'perfect': ("Perfect!", COLORS['perfect']),
+        'good': ("Good!", COLORS['good']),
+        'miss': ("Miss!", COLORS['miss']),
+    }
+
     # レイアウト定数
     HEADER_HEIGHT = 60
     FOOTER_HEIGHT = 80
@@ -41,6 +48,9 @@ class UIRenderer:
     JUDGMENT_DISPLAY_TIME = 1000  # ms - 判定表示時間
     JUDGMENT_FADE_TIME = 500      # ms - 判定フェード時間
 
+    # テキストサーフェスキャッシュの上限
+    TEXT_CACHE_SIZE = 128
+
     def __init__(self, screen: pygame.Surface, config: Config):
         """UIRendererの初期化
         
@@ -58,12 +68,59 @@ class UIRenderer:
         self.font_large = pygame.font.Font(None, 48)
         self.font_small = pygame.font.Font(None, 24)
         
-        # アクティブな判定フィードバック
-        self.active_judgments = []
+        # 描画済みテキストのキャッシュ（LRU）
+        self._text_cache = {}
+        
+        # 一時停止オーバーレイ（初回の一時停止時に作成）
+        self._pause_overlay = None
+        
+        # ノート画像（初回のノート描画時に作成）
+        self._note_sprite = None
+        
+        # 画面更新範囲（毎フレーム変わる要素の描画範囲）
+        self._dirty_rects = []
+        self._previous_dirty_rects = []
+        self._full_update = True
+        
+        # アクティブな判定フィードバック（開始時刻順に追加される）
+        self.active_judgments = deque()
+        
+        # 経過時間（ミリ秒）ごとのフェードアウト用アルファ値
+        fade_span = self.JUDGMENT_DISPLAY_TIME - self.JUDGMENT_FADE_TIME
+        self._alpha_table = tuple(
+            255 if elapsed <= self.JUDGMENT_FADE_TIME
+            else int(max(0, 255 - ((elapsed - self.JUDGMENT_FADE_TIME) / fade_span) * 255))
+            for elapsed in range(self.JUDGMENT_DISPLAY_TIME + 1)
+        )
         
         # フレーム管理
         self.last_frame_time = 0
 
+    def _render_text(self, font: pygame.font.Font, text: str, color: Tuple) -> pygame.Surface:
+        """テキストを描画し、同じ内容ならサーフェスを再利用
+        
+        Args:
+            font: 使用するフォント
+            text: 描画する文字列
+            color: 文字色
+            
+        Returns:
+            描画済みのテキストサーフェス
+        """
+        key = (id(font), text, color)
+        surface = self._text_cache.pop(key, None)
+        if surface is None:
+            surface = font.render(text, True, color)
+            # 表示モードが設定済みなら画面と同じピクセル形式に変換して転送を速くする
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert_alpha()
+            if len(self._text_cache) >= self.TEXT_CACHE_SIZE:
+                self._text_cache.pop(next(iter(self._text_cache)))
+        
+        # 末尾に入れ直して最近使ったものとして扱う
+        self._text_cache[key] = surface
+        return surface
+
     def clear_screen(self) -> None:
         """画面をクリア"""
         self.screen.fill(self.COLORS['background'])
@@ -78,19 +135,32 @@ class UIRenderer:
         Returns:
             (x, y): ノートの画面座標
         """
-        # ノート落下の進行度計算
-        time_to_hit = note.hit_time - current_time
-        progress = 1.0 - (time_to_hit / self.FALL_DURATION)
-        
         # Y座標計算（上から下へ）
         start_y = self.HEADER_HEIGHT
-        target_y = self.JUDGMENT_LINE_Y
-        y = start_y + (target_y - start_y) * progress
+        y = self._fall_y(
+            note.hit_time - current_time,
+            start_y, self.JUDGMENT_LINE_Y - start_y, self.FALL_DURATION
+        )
         
         # X座標（画面中央固定）
         x = self.screen_width // 2
         
-        return (int(x), int(y))
+        return (int(x), y)
+
+    @staticmethod
+    def _fall_y(time_to_hit: float, start_y: int, span_y: int, fall_duration: float) -> int:
+        """判定ラインまでの残り時間からノートのY座標を計算
+        
+        Args:
+            time_to_hit: 判定時刻までの残り時間（ミリ秒）
+            start_y: 落下開始位置のY座標
+            span_y: 落下開始位置から判定ラインまでの距離
+            fall_duration: 判定ラインに到達するまでの時間（ミリ秒）
+            
+        Returns:
+            ノートのY座標
+        """
+        return int(start_y + span_y * (1.0 - time_to_hit / fall_duration))
 
     def render_notes(self, notes: List[Note], current_time: float) -> None:
         """ノートの描画とアニメーション
@@ -99,28 +169,60 @@ class UIRenderer:
             notes: 描画するノートリスト
             current_time: 現在時刻（ミリ秒）
         """
+        if not notes:
+            return
+        
+        sprite = self._get_note_sprite()
+        offset = self.NOTE_RADIUS + 1
+        blit_sequence = []
+        
+        # フレーム内で共通の値は一度だけ計算
+        fall_y = self._fall_y
+        start_y = self.HEADER_HEIGHT
+        span_y = self.JUDGMENT_LINE_Y - start_y
+        fall_duration = self.FALL_DURATION
+        sprite_x = self.screen_width // 2 - offset
+        min_y = -self.NOTE_RADIUS
+        max_y = self.screen_height + self.NOTE_RADIUS
+        
         for note in notes:
-            # ノート位置を計算
-            x, y = self.calculate_note_position(note, current_time)
+            # ノートのY座標を計算
+            y = fall_y(note.hit_time - current_time, start_y, span_y, fall_duration)
             
             # 画面内にあるノートのみ描画
-            if -self.NOTE_RADIUS <= y <= self.screen_height + self.NOTE_RADIUS:
-                # ノート本体（白い円）
-                pygame.draw.circle(
-                    self.screen,
-                    self.COLORS['note'],
-                    (x, y),
-                    self.NOTE_RADIUS
-                )
-                
-                # ノート輪郭（黒い縁）
-                pygame.draw.circle(
-                    self.screen,
-                    (0, 0, 0),
-                    (x, y),
-                    self.NOTE_RADIUS,
-                    2
-                )
+            if min_y <= y <= max_y:
+                blit_sequence.append((sprite, (sprite_x, y - offset)))
+        
+        # 見えているノートをまとめて転送
+        if blit_sequence:
+            self.screen.blits(blit_sequence, False)
+            self._dirty_rects.append(
+                pygame.Rect(sprite_x, 0, sprite.get_width(), self.screen_height)
+            )
+
+    def _get_note_sprite(self) -> pygame.Surface:
+        """ノート画像を取得（初回のみ作成）
+        
+        Returns:
+            白い円に黒い縁を付けたノート画像
+        """
+        if self._note_sprite is None:
+            radius = self.NOTE_RADIUS
+            size = radius * 2 + 2
+            center = (radius + 1, radius + 1)
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            
+            # ノート本体（白い円）
+            pygame.draw.circle(sprite, self.COLORS['note'], center, radius)
+            
+            # ノート輪郭（黒い縁）
+            pygame.draw.circle(sprite, (0, 0, 0), center, radius, 2)
+            
+            # 表示モードが設定済みなら画面と同じピクセル形式に変換
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            self._note_sprite = sprite
+        return self._note_sprite
 
     def render_score(self, score: int, combo: int, multiplier: float) -> None:
         """スコア・コンボ表示
@@ -132,26 +234,29 @@ class UIRenderer:
         """
         # スコア表示
         score_text = f"Score: {score:,}"
-        score_surface = self.font.render(score_text, True, self.COLORS['text'])
+        score_surface = self._render_text(self.font, score_text, self.COLORS['text'])
         score_rect = score_surface.get_rect()
         score_rect.topright = (self.screen_width - 20, 10)
         self.screen.blit(score_surface, score_rect)
+        self._dirty_rects.append(score_rect)
         
         # コンボ表示
         combo_text = f"Combo: {combo}x"
-        combo_surface = self.font.render(combo_text, True, self.COLORS['text'])
+        combo_surface = self._render_text(self.font, combo_text, self.COLORS['text'])
         combo_rect = combo_surface.get_rect()
         combo_rect.topright = (self.screen_width - 20, 40)
         self.screen.blit(combo_surface, combo_rect)
+        self._dirty_rects.append(combo_rect)
         
         # 倍率表示（コンボが10以上の時）
         if combo >= 10:
             multiplier_text = f"Multiplier: {multiplier:.1f}x"
             multiplier_color = self.COLORS['good'] if multiplier > 1.0 else self.COLORS['text']
-            multiplier_surface = self.font_small.render(multiplier_text, True, multiplier_color)
+            multiplier_surface = self._render_text(self.font_small, multiplier_text, multiplier_color)
             multiplier_rect = multiplier_surface.get_rect()
             multiplier_rect.topright = (self.screen_width - 20, 70)
             self.screen.blit(multiplier_surface, multiplier_rect)
+            self._dirty_rects.append(multiplier_rect)
 
     def render_judgment(self, judgment_result: Optional[JudgmentResult]) -> None:
         """判定結果フィードバック
@@ -163,31 +268,24 @@ class UIRenderer:
             return
             
         # 判定テキストと色を決定
-        judgment_text = ""
-        judgment_color = self.COLORS['text']
-        
-        if judgment_result.judgment == 'perfect':
-            judgment_text = "Perfect!"
-            judgment_color = self.COLORS['perfect']
-        elif judgment_result.judgment == 'good':
-            judgment_text = "Good!"
-            judgment_color = self.COLORS['good']
-        elif judgment_result.judgment == 'miss':
-            judgment_text = "Miss!"
-            judgment_color = self.COLORS['miss']
+        judgment_text, judgment_color = self.JUDGMENT_STYLES.get(
+            judgment_result.judgment, ("", self.COLORS['text'])
+        )
         
         # 判定テキスト描画
-        judgment_surface = self.font_large.render(judgment_text, True, judgment_color)
+        judgment_surface = self._render_text(self.font_large, judgment_text, judgment_color)
         judgment_rect = judgment_surface.get_rect()
         judgment_rect.center = (self.screen_width // 2, self.JUDGMENT_LINE_Y - 60)
         self.screen.blit(judgment_surface, judgment_rect)
+        self._dirty_rects.append(judgment_rect)
         
         # タイミング差表示
         timing_text = f"{judgment_result.timing_diff:+.0f}ms"
-        timing_surface = self.font_small.render(timing_text, True, judgment_color)
+        timing_surface = self._render_text(self.font_small, timing_text, judgment_color)
         timing_rect = timing_surface.get_rect()
         timing_rect.center = (self.screen_width // 2, self.JUDGMENT_LINE_Y - 30)
         self.screen.blit(timing_surface, timing_rect)
+        self._dirty_rects.append(timing_rect)
 
     def render_game_info(self, music_name: str, progress: float) -> None:
         """ゲーム情報表示
@@ -197,7 +295,7 @@ class UIRenderer:
             progress: 再生進行度（0.0-1.0）
         """
         # 音楽名表示
-        music_surface = self.font.render(music_name, True, self.COLORS['text'])
+        music_surface = self._render_text(self.font, music_name, self.COLORS['text'])
         music_rect = music_surface.get_rect()
         music_rect.topleft = (20, 10)
         self.screen.blit(music_surface, music_rect)
@@ -215,6 +313,7 @@ class UIRenderer:
         )
         pygame.draw.rect(self.screen, (50, 50, 50), progress_bg_rect)
         pygame.draw.rect(self.screen, self.COLORS['text'], progress_bg_rect, 2)
+        self._dirty_rects.append(progress_bg_rect)
         
         # プログレスバー進行度
         if progress > 0:
@@ -227,10 +326,11 @@ class UIRenderer:
         
         # 進行度テキスト
         progress_text = f"{progress * 100:.1f}%"
-        progress_surface = self.font_small.render(progress_text, True, self.COLORS['text'])
+        progress_surface = self._render_text(self.font_small, progress_text, self.COLORS['text'])
         progress_rect = progress_surface.get_rect()
         progress_rect.topleft = (progress_bar_x + progress_bar_width + 10, progress_bar_y + 2)
         self.screen.blit(progress_surface, progress_rect)
+        self._dirty_rects.append(progress_rect)
 
     def render_judgment_line(self) -> None:
         """判定ライン描画"""
@@ -244,22 +344,25 @@ class UIRenderer:
 
     def render_pause_overlay(self) -> None:
         """一時停止画面描画"""
-        # 半透明オーバーレイ
-        overlay_surface = pygame.Surface((self.screen_width, self.screen_height))
-        overlay_surface.set_alpha(128)
-        overlay_surface.fill((0, 0, 0))
-        self.screen.blit(overlay_surface, (0, 0))
+        # 半透明オーバーレイ（毎フレーム作り直さず使い回す）
+        if self._pause_overlay is None:
+            self._pause_overlay = pygame.Surface((self.screen_width, self.screen_height))
+            if pygame.display.get_surface() is not None:
+                self._pause_overlay = self._pause_overlay.convert()
+            self._pause_overlay.set_alpha(128)
+            self._pause_overlay.fill((0, 0, 0))
+        self.screen.blit(self._pause_overlay, (0, 0))
         
         # "PAUSED"テキスト
         pause_text = "PAUSED"
-        pause_surface = self.font_large.render(pause_text, True, self.COLORS['text'])
+        pause_surface = self._render_text(self.font_large, pause_text, self.COLORS['text'])
         pause_rect = pause_surface.get_rect()
         pause_rect.center = (self.screen_width // 2, self.screen_height // 2)
         self.screen.blit(pause_surface, pause_rect)
         
         # 操作説明
         instruction_text = "Press SPACE to resume"
-        instruction_surface = self.font.render(instruction_text, True, self.COLORS['text'])
+        instruction_surface = self._render_text(self.font, instruction_text, self.COLORS['text'])
         instruction_rect = instruction_surface.get_rect()
         instruction_rect.center = (self.screen_width // 2, self.screen_height // 2 + 50)
         self.screen.blit(instruction_surface, instruction_rect)
@@ -285,44 +388,52 @@ class UIRenderer:
         """
         current_time = pygame.time.get_ticks()
         
-        # 期限切れの判定フィードバックを削除
-        self.active_judgments = [
-            feedback for feedback in self.active_judgments
-            if current_time - feedback['start_time'] < self.JUDGMENT_DISPLAY_TIME
-        ]
+        # 期限切れの判定フィードバックを先頭から削除（古い順に並んでいる）
+        active_judgments = self.active_judgments
+        while (active_judgments and
+               current_time - active_judgments[0]['start_time'] >= self.JUDGMENT_DISPLAY_TIME):
+            active_judgments.popleft()
         
         self.last_frame_time = current_time
 
     def render_active_judgments(self) -> None:
         """アクティブな判定フィードバックを描画"""
         current_time = pygame.time.get_ticks()
+        alpha_table = self._alpha_table
+        last_index = self.JUDGMENT_DISPLAY_TIME
         
         for feedback in self.active_judgments:
             elapsed_time = current_time - feedback['start_time']
             
-            # フェードアウト計算
-            if elapsed_time > self.JUDGMENT_FADE_TIME:
-                alpha = max(0, 255 - ((elapsed_time - self.JUDGMENT_FADE_TIME) / 
-                                    (self.JUDGMENT_DISPLAY_TIME - self.JUDGMENT_FADE_TIME)) * 255)
-            else:
-                alpha = 255
+            # フェードアウト値を表から取得（表示時間を過ぎたものは0、
+            # 開始時刻より前なら不透明）
+            alpha = alpha_table[max(0, min(elapsed_time, last_index))]
             
             if alpha > 0:
                 # 判定結果描画
                 result = feedback['result']
                 position = feedback['position']
                 
-                # 判定テキスト
-                judgment_text = result.judgment.capitalize() + "!"
-                judgment_color = self.COLORS.get(result.judgment, self.COLORS['text'])
-                
-                # アルファブレンディング用サーフェス作成
-                text_surface = self.font_large.render(judgment_text, True, judgment_color)
-                text_surface.set_alpha(int(alpha))
+                # set_alphaはサーフェスを書き換えるため共有キャッシュは使わず、
+                # フィードバックごとに一度だけ作成する
+                text_surface = feedback.get('surface')
+                if text_surface is None:
+                    style = self.JUDGMENT_STYLES.get(result.judgment)
+                    if style is None:
+                        style = (result.judgment.capitalize() + "!", self.COLORS['text'])
+                    judgment_text, judgment_color = style
+                    text_surface = self.font_large.render(judgment_text, True, judgment_color)
+                    feedback['surface'] = text_surface
+                text_surface.set_alpha(alpha)
                 
                 text_rect = text_surface.get_rect()
                 text_rect.center = position
                 self.screen.blit(text_surface, text_rect)
+                self._dirty_rects.append(text_rect)
+
+    def invalidate(self) -> None:
+        """次のフレームで画面全体を更新する（他の画面から切り替えた時など）"""
+        self._full_update = True
 
     def render_frame(self, game_state: Dict) -> None:
         """1フレーム全体の描画
@@ -330,6 +441,8 @@ class UIRenderer:
         Args:
             game_state: ゲーム状態辞書
         """
+        self._dirty_rects.clear()
+        
         # 背景クリア
         self.clear_screen()
         
@@ -356,11 +469,20 @@ class UIRenderer:
         )
         
         # 一時停止状態の場合はオーバーレイ表示
-        if game_state.get('paused', False):
+        paused = game_state.get('paused', False)
+        if paused:
             self.render_pause_overlay()
         
         # 画面更新
-        pygame.display.flip()
+        # 静的な要素は毎フレーム同じ画素になるため、前フレームと今フレームで
+        # 変化する要素を描いた範囲だけを転送する
+        if self._full_update or paused:
+            pygame.display.flip()
+            # オーバーレイを消すため、再開後の最初のフレームも全体を更新
+            self._full_update = paused
+        else:
+            pygame.display.update(self._previous_dirty_rects + self._dirty_rects)
+        self._previous_dirty_rects, self._dirty_rects = self._dirty_rects, self._previous_dirty_rects
 
     def render_background(self) -> None:
         """背景描画（将来の拡張用）"""
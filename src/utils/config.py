@@ -6,8 +6,11 @@ import os
 from typing import Optional
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file; reload() keeps module globals,
+# so a reloaded module skips re-parsing the file
+if not globals().get("_dotenv_loaded"):
+    load_dotenv()
+    _dotenv_loaded = True
 
 
 class Config:
@@ -23,12 +26,18 @@ class Config:
     GAME_WINDOW_WIDTH: int = int(os.getenv("GAME_WINDOW_WIDTH", "800"))
     GAME_WINDOW_HEIGHT: int = int(os.getenv("GAME_WINDOW_HEIGHT", "600"))
     AUDIO_BUFFER_SIZE: int = int(os.getenv("AUDIO_BUFFER_SIZE", "1024"))
+    AUDIO_FREQUENCY: int = int(os.getenv("AUDIO_FREQUENCY", "44100"))
+    AUDIO_CHANNELS: int = int(os.getenv("AUDIO_CHANNELS", "2"))
+    AUDIO_SAMPLE_SIZE: int = int(os.getenv("AUDIO_SAMPLE_SIZE", "-16"))
     TARGET_FPS: int = int(os.getenv("TARGET_FPS", "60"))
 
     # Development
     DEBUG_MODE: bool = os.getenv("DEBUG_MODE", "false").lower() == "true"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # Startup banner, built on first use
+    _debug_banner: Optional[str] = None
+
     @classmethod
     def validate(cls) -> bool:
         """Validate configuration settings"""
@@ -47,6 +56,15 @@ class Config:
         if cls.AUDIO_BUFFER_SIZE <= 0:
             errors.append("AUDIO_BUFFER_SIZE must be positive")
 
+        if cls.AUDIO_FREQUENCY <= 0:
+            errors.append("AUDIO_FREQUENCY must be positive")
+
+        if cls.AUDIO_CHANNELS <= 0:
+            errors.append("AUDIO_CHANNELS must be positive")
+
+        if cls.AUDIO_SAMPLE_SIZE not in (-16, 16, -8, 8, 32):
+            errors.append("AUDIO_SAMPLE_SIZE must be one of -16, 16, -8, 8, 32")
+
         # Warn about missing API key (not required for basic functionality)
         if not cls.AMAZON_Q_API_KEY and cls.DEBUG_MODE:
             print("Warning: AMAZON_Q_API_KEY not set. Stage generation will not work.")
@@ -65,3 +83,19 @@ class Config:
     def is_debug(cls) -> bool:
         """Check if debug mode is enabled"""
         return cls.DEBUG_MODE
+
+    @classmethod
+    def debug_banner(cls) -> str:
+        """Get the startup debug banner, building it once"""
+        if cls._debug_banner is None:
+            api_status = "Configured" if cls.AMAZON_Q_API_KEY else "Not configured"
+            cls._debug_banner = "\n".join([
+                "=== Everyday Rhythm ===",
+                f"Debug mode: {cls.DEBUG_MODE}",
+                f"Window size: {cls.get_window_size()}",
+                f"Target FPS: {cls.TARGET_FPS}",
+                f"Audio buffer: {cls.AUDIO_BUFFER_SIZE}",
+                f"Amazon Q API: {api_status}",
+                "========================",
+            ])
+        return cls._debug_banner
@@ -0,0 +1,39 @@
+"""
+Shared pytest fixtures
+"""
+import os
+
+# Use SDL's dummy audio device unless a driver is chosen explicitly; each
+# pytest-xdist worker then opens its own device-free mixer
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+
+def _open_test_mixer():
+    """Open the pygame mixer with the small test buffer"""
+    pygame.mixer.pre_init(buffer=512)  # Small buffer for testing
+    pygame.mixer.init()
+
+
+@pytest.fixture(scope="module")
+def audio_mixer():
+    """Open the pygame mixer once per test module"""
+    _open_test_mixer()
+    yield pygame.mixer.get_init()
+    pygame.mixer.quit()
+
+
+@pytest.fixture
+def mixer_reset(audio_mixer):
+    """Stop playback after each test and restore the shared mixer if a test changed it"""
+    yield
+    if pygame.mixer.get_init():
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
+
+    # Some tests close the mixer or reopen it with another format
+    if pygame.mixer.get_init() != audio_mixer:
+        pygame.mixer.quit()
+        _open_test_mixer()
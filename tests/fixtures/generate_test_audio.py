@@ -2,6 +2,7 @@
 """
 Generate test audio files for testing
 """
+import math
 import numpy as np
 import wave
 import os
@@ -10,12 +11,21 @@ import os
 def generate_test_wav(filename: str, duration: float = 2.0, frequency: float = 440.0, sample_rate: int = 44100):
     """Generate a simple sine wave test audio file"""
     
-    # Generate sine wave
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    wave_data = np.sin(2 * np.pi * frequency * t)
+    # An integer-Hz tone repeats exactly every sample_rate / gcd(sample_rate, frequency)
+    # samples, so only that block is synthesized and then tiled
+    num_samples = int(sample_rate * duration)
+    block_samples = num_samples
+    if float(frequency).is_integer():
+        block_samples = min(sample_rate // math.gcd(sample_rate, int(frequency)), num_samples)
+    
+    # Generate sine wave in float32, reusing one buffer for phase, sine and scaling
+    wave_data = np.arange(block_samples, dtype=np.float32)
+    wave_data *= np.float32(2 * np.pi * frequency / sample_rate)
+    np.sin(wave_data, out=wave_data)
     
     # Convert to 16-bit integers
-    wave_data = (wave_data * 32767).astype(np.int16)
+    wave_data *= np.float32(32767)
+    wave_data = np.resize(wave_data.astype(np.int16), num_samples)
     
     # Write WAV file
     with wave.open(filename, 'w') as wav_file:
@@ -2,9 +2,10 @@
 """
 Generate test MP3 files for testing
 """
+import math
 import numpy as np
-import wave
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     from pydub import AudioSegment
@@ -21,39 +22,40 @@ def generate_test_mp3(filename: str, duration: float = 3.0, frequency: float = 4
         print("pydub is required to generate MP3 files")
         return False
     
-    # Generate sine wave
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    wave_data = np.sin(2 * np.pi * frequency * t)
+    # An integer-Hz tone repeats exactly every sample_rate / gcd(sample_rate, frequency)
+    # samples, so only that block is synthesized and then tiled
+    num_samples = int(sample_rate * duration)
+    block_samples = num_samples
+    if float(frequency).is_integer():
+        block_samples = min(sample_rate // math.gcd(sample_rate, int(frequency)), num_samples)
     
-    # Convert to 16-bit integers
-    wave_data = (wave_data * 32767).astype(np.int16)
+    # Generate sine wave in float32, reusing one buffer for phase, sine and scaling
+    wave_data = np.arange(block_samples, dtype=np.float32)
+    wave_data *= np.float32(2 * np.pi * frequency / sample_rate)
+    np.sin(wave_data, out=wave_data)
     
-    # Create temporary WAV file
-    temp_wav = filename.replace('.mp3', '_temp.wav')
+    # Convert to 16-bit integers
+    wave_data *= np.float32(32767)
+    wave_data = np.resize(wave_data.astype(np.int16), num_samples)
     
     try:
-        # Write WAV file first
-        with wave.open(temp_wav, 'w') as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(sample_rate)
-            wav_file.writeframes(wave_data.tobytes())
-        
-        # Convert WAV to MP3 using pydub
-        audio = AudioSegment.from_wav(temp_wav)
+        # Encode the PCM samples directly; no intermediate WAV file is needed
+        audio = AudioSegment(
+            data=wave_data.tobytes(),
+            sample_width=2,  # 16-bit
+            frame_rate=sample_rate,
+            channels=1,  # Mono
+        )
         audio.export(filename, format="mp3", bitrate="128k")
         
-        # Remove temporary WAV file
-        os.remove(temp_wav)
-        
         print(f"Generated test MP3: {filename}")
         return True
         
     except Exception as e:
         print(f"Error generating MP3 {filename}: {e}")
-        # Clean up temp file if it exists
-        if os.path.exists(temp_wav):
-            os.remove(temp_wav)
+        # Clean up a partially written MP3 if it exists
+        if os.path.exists(filename):
+            os.remove(filename)
         return False
 
 
@@ -66,11 +68,21 @@ def main():
         print("pip install pydub")
         return
     
-    # Generate different test files
-    success = True
-    success &= generate_test_mp3(os.path.join(fixtures_dir, "test_short.mp3"), duration=1.0, frequency=440.0)
-    success &= generate_test_mp3(os.path.join(fixtures_dir, "test_medium.mp3"), duration=3.0, frequency=880.0)
-    success &= generate_test_mp3(os.path.join(fixtures_dir, "test_long.mp3"), duration=5.0, frequency=220.0)
+    # Generate different test files; each export runs its own ffmpeg process,
+    # so threads are enough to encode them side by side
+    fixtures = [
+        ("test_short.mp3", 1.0, 440.0),
+        ("test_medium.mp3", 3.0, 880.0),
+        ("test_long.mp3", 5.0, 220.0),
+    ]
+    with ThreadPoolExecutor(max_workers=len(fixtures)) as executor:
+        results = list(executor.map(
+            lambda fixture: generate_test_mp3(
+                os.path.join(fixtures_dir, fixture[0]), duration=fixture[1], frequency=fixture[2]
+            ),
+            fixtures,
+        ))
+    success = all(results)
     
     if success:
         print("Test MP3 files generated successfully!")
@@ -4,44 +4,39 @@ Integration tests for audio system
 import pytest
 import pygame
 import os
-import sys
 import time
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from audio.audio_manager import AudioManager
 from audio.audio_analyzer import AudioAnalyzer
 
+# Test audio files, generated by tests/fixtures/generate_test_audio.py
+_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+_TEST_AUDIO_SHORT = os.path.join(_FIXTURES_DIR, 'test_short.wav')
+_TEST_AUDIO_MEDIUM = os.path.join(_FIXTURES_DIR, 'test_medium.wav')
+_INVALID_AUDIO = os.path.join(_FIXTURES_DIR, 'nonexistent.wav')
+
+# The mixer is opened once for this module; see tests/conftest.py
+pytestmark = pytest.mark.usefixtures("mixer_reset")
+
 
 class TestAudioIntegration:
     """Integration tests for audio system components"""
     
-    def setup_method(self):
-        """Setup test environment before each test"""
-        # Initialize pygame for testing
-        pygame.mixer.pre_init(buffer=512)
-        pygame.mixer.init()
-        
-        # Path to test audio files
-        self.fixtures_dir = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
-        self.test_audio_short = os.path.join(self.fixtures_dir, 'test_short.wav')
-        self.test_audio_medium = os.path.join(self.fixtures_dir, 'test_medium.wav')
-    
-    def teardown_method(self):
-        """Cleanup after each test"""
-        pygame.mixer.stop()
-        pygame.mixer.quit()
+    @classmethod
+    def setup_class(cls):
+        """Setup shared state once for the class"""
+        # One analyzer for all tests, so each fixture is decoded and analyzed once
+        cls.analyzer = AudioAnalyzer()
     
     def test_audio_manager_and_analyzer_integration(self):
         """Test AudioManager and AudioAnalyzer working together"""
         # Arrange
         manager = AudioManager()
-        analyzer = AudioAnalyzer()
+        analyzer = self.analyzer
         
         # Act - Load and analyze audio
-        load_result = manager.load_music(self.test_audio_short)
-        analysis_result = analyzer.analyze_audio(self.test_audio_short)
+        load_result = manager.load_music(_TEST_AUDIO_SHORT)
+        analysis_result = analyzer.analyze_audio(_TEST_AUDIO_SHORT)
         
         # Assert
         assert load_result == True
@@ -63,9 +58,9 @@ class TestAudioIntegration:
         """Test audio file format compatibility"""
         # Arrange
         manager = AudioManager()
-        analyzer = AudioAnalyzer()
+        analyzer = self.analyzer
         
-        test_files = [self.test_audio_short, self.test_audio_medium]
+        test_files = [_TEST_AUDIO_SHORT, _TEST_AUDIO_MEDIUM]
         
         for audio_file in test_files:
             if os.path.exists(audio_file):
@@ -90,16 +85,16 @@ class TestAudioIntegration:
         """Test audio timing accuracy between manager and analyzer"""
         # Arrange
         manager = AudioManager()
-        analyzer = AudioAnalyzer()
+        analyzer = self.analyzer
         
         # Load audio file
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         
         # Get duration from both sources
         manager_duration = manager.get_duration()
         
         if analyzer.is_available():
-            analysis_result = analyzer.analyze_audio(self.test_audio_short)
+            analysis_result = analyzer.analyze_audio(_TEST_AUDIO_SHORT)
             if analysis_result and 'duration' in analysis_result:
                 analyzer_duration = analysis_result['duration'] * 1000  # Convert to ms
                 
@@ -111,14 +106,14 @@ class TestAudioIntegration:
         """Test using analysis data to control playback"""
         # Arrange
         manager = AudioManager()
-        analyzer = AudioAnalyzer()
+        analyzer = self.analyzer
         
         # Load and analyze
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         
         if analyzer.is_available():
-            tempo = analyzer.get_tempo(self.test_audio_short)
-            beats = analyzer.get_beats(self.test_audio_short)
+            tempo = analyzer.get_tempo(_TEST_AUDIO_SHORT)
+            beats = analyzer.get_beats(_TEST_AUDIO_SHORT)
             
             # Start playback
             manager.play_music()
@@ -143,7 +138,7 @@ class TestAudioIntegration:
         # Test volume levels
         test_volumes = [0.0, 0.25, 0.5, 0.75, 1.0]
         
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         
         for volume in test_volumes:
             # Act
@@ -161,10 +156,10 @@ class TestAudioIntegration:
         """Test error recovery in audio system"""
         # Arrange
         manager = AudioManager()
-        analyzer = AudioAnalyzer()
+        analyzer = self.analyzer
         
         # Test with invalid file
-        invalid_file = os.path.join(self.fixtures_dir, 'nonexistent.wav')
+        invalid_file = _INVALID_AUDIO
         
         # Act
         load_result = manager.load_music(invalid_file)
@@ -175,7 +170,7 @@ class TestAudioIntegration:
         assert analysis_result == {}
         
         # Verify system can still work with valid files after error
-        valid_load = manager.load_music(self.test_audio_short)
+        valid_load = manager.load_music(_TEST_AUDIO_SHORT)
         assert valid_load == True
     
     def test_audio_cleanup_integration(self):
@@ -184,7 +179,7 @@ class TestAudioIntegration:
         manager = AudioManager()
         
         # Use audio system
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         manager.play_music()
         time.sleep(0.1)
         
@@ -201,7 +196,7 @@ class TestAudioIntegration:
         """Test loading and playing multiple audio files in sequence"""
         # Arrange
         manager = AudioManager()
-        test_files = [self.test_audio_short, self.test_audio_medium]
+        test_files = [_TEST_AUDIO_SHORT, _TEST_AUDIO_MEDIUM]
         
         for audio_file in test_files:
             if os.path.exists(audio_file):
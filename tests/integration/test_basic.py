@@ -2,6 +2,7 @@
 Integration tests for basic game functionality
 """
 
+import importlib.util
 import pytest
 import subprocess
 import sys
@@ -9,9 +10,6 @@ import os
 import time
 from unittest.mock import patch
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
-
 from utils.config import Config
 
 
@@ -23,6 +21,12 @@ class TestBasicIntegration:
         # Should not raise any exceptions with default config
         assert Config.validate() == True
 
+    @patch.object(Config, "AUDIO_SAMPLE_SIZE", 12)
+    def test_config_validation_rejects_sample_size(self):
+        """Test validation rejects a sample size the mixer does not support"""
+        with pytest.raises(ValueError, match="AUDIO_SAMPLE_SIZE"):
+            Config.validate()
+
     def test_config_window_size(self):
         """Test window size configuration"""
         width, height = Config.get_window_size()
@@ -36,6 +40,13 @@ class TestBasicIntegration:
         debug_mode = Config.is_debug()
         assert isinstance(debug_mode, bool)
 
+    def test_config_debug_banner(self):
+        """Test debug banner is built once and reused"""
+        banner = Config.debug_banner()
+        assert banner.startswith("=== Everyday Rhythm ===")
+        assert f"Window size: {Config.get_window_size()}" in banner
+        assert Config.debug_banner() is banner
+
     def test_main_script_test_mode(self):
         """Test main script runs in test mode without errors"""
         # Run main.py in test mode
@@ -49,19 +60,22 @@ class TestBasicIntegration:
         assert result.returncode == 0
         assert "Test mode: Game initialized successfully" in result.stdout
 
-    def test_main_script_help(self):
+    def test_main_script_help(self, capsys):
         """Test main script help output"""
-        result = subprocess.run(
-            [sys.executable, "main.py", "--help"],
-            capture_output=True,
-            text=True,
-            cwd=os.path.join(os.path.dirname(__file__), "..", ".."),
-        )
+        # Run in-process; the test-mode test above keeps the subprocess check
+        main_path = os.path.join(os.path.dirname(__file__), "..", "..", "main.py")
+        spec = importlib.util.spec_from_file_location("everyday_rhythm_main", main_path)
+        main_module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(main_module)
 
-        assert result.returncode == 0
-        assert "Everyday Rhythm" in result.stdout
-        assert "--debug" in result.stdout
-        assert "--test-mode" in result.stdout
+        with pytest.raises(SystemExit) as exit_info:
+            main_module.main(["--help"])
+
+        stdout = capsys.readouterr().out
+        assert exit_info.value.code == 0
+        assert "Everyday Rhythm" in stdout
+        assert "--debug" in stdout
+        assert "--test-mode" in stdout
 
     @patch.dict(os.environ, {"GAME_WINDOW_WIDTH": "1024", "GAME_WINDOW_HEIGHT": "768"})
     def test_config_environment_override(self):
@@ -77,6 +91,16 @@ class TestBasicIntegration:
         assert width == 1024
         assert height == 768
 
+    def test_config_reload_skips_dotenv(self):
+        """Test reloading config does not parse .env again"""
+        from importlib import reload
+        from utils import config
+
+        with patch("dotenv.load_dotenv") as mock_load_dotenv:
+            reload(config)
+
+        mock_load_dotenv.assert_not_called()
+
     def test_requirements_file_exists(self):
         """Test requirements.txt file exists and contains expected packages"""
         requirements_path = os.path.join(
@@ -3,27 +3,41 @@ Unit tests for AudioAnalyzer class
 """
 import pytest
 import os
-import sys
 import numpy as np
-from unittest.mock import Mock, patch, MagicMock
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from unittest.mock import patch
 
 from audio.audio_analyzer import AudioAnalyzer
 
+# Test audio files, generated by tests/fixtures/generate_test_audio.py
+_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+_TEST_AUDIO_SHORT = os.path.join(_FIXTURES_DIR, 'test_short.wav')
+_TEST_AUDIO_MEDIUM = os.path.join(_FIXTURES_DIR, 'test_medium.wav')
+_INVALID_AUDIO = os.path.join(_FIXTURES_DIR, 'nonexistent.wav')
+
+# Shared read-only signal returned by the patched librosa.load
+_MOCK_Y = np.array([0.1, 0.2, 0.3, 0.4], dtype=np.float32)
+_MOCK_Y.setflags(write=False)
+_MOCK_SR = 22050
+_MOCK_BEATS = np.array([0, 1, 2, 3])
+_MOCK_BEATS.setflags(write=False)
+
+
+@pytest.fixture(scope="module")
+def shared_analyzer():
+    """One AudioAnalyzer for the whole module"""
+    return AudioAnalyzer()
+
+
+@pytest.fixture
+def analyzer(shared_analyzer):
+    """The shared AudioAnalyzer, with its caches emptied after each test"""
+    yield shared_analyzer
+    shared_analyzer.clear_cache()
+
 
 class TestAudioAnalyzer:
     """Test cases for AudioAnalyzer class"""
     
-    def setup_method(self):
-        """Setup test environment before each test"""
-        # Path to test audio files
-        self.fixtures_dir = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
-        self.test_audio_short = os.path.join(self.fixtures_dir, 'test_short.wav')
-        self.test_audio_medium = os.path.join(self.fixtures_dir, 'test_medium.wav')
-        self.invalid_audio = os.path.join(self.fixtures_dir, 'nonexistent.wav')
-    
     def test_audio_analyzer_initialization(self):
         """Test AudioAnalyzer initializes correctly"""
         # Act
@@ -33,42 +47,31 @@ class TestAudioAnalyzer:
         assert analyzer is not None
     
     @patch('librosa.load')
-    def test_analyze_audio_valid_file(self, mock_load):
+    def test_analyze_audio_valid_file(self, mock_load, analyzer):
         """Test analyzing valid audio file"""
         # Arrange
-        mock_y = np.array([0.1, 0.2, 0.3, 0.4])
-        mock_sr = 22050
-        mock_load.return_value = (mock_y, mock_sr)
-        
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
         
         # Act
-        result = analyzer.analyze_audio(self.test_audio_short)
+        result = analyzer.analyze_audio(_TEST_AUDIO_SHORT)
         
         # Assert
         assert isinstance(result, dict)
-        assert 'tempo' in result
-        assert 'beats' in result
-        assert 'duration' in result
-        assert 'sample_rate' in result
-        mock_load.assert_called_once_with(self.test_audio_short)
+        assert {'tempo', 'beats', 'duration', 'sample_rate'} <= result.keys()
+        mock_load.assert_called_once_with(
+            _TEST_AUDIO_SHORT, sr=22050, mono=True, res_type='soxr_lq'
+        )
     
-    def test_analyze_audio_invalid_file(self):
+    def test_analyze_audio_invalid_file(self, analyzer):
         """Test analyzing invalid audio file"""
-        # Arrange
-        analyzer = AudioAnalyzer()
-        
         # Act
-        result = analyzer.analyze_audio(self.invalid_audio)
+        result = analyzer.analyze_audio(_INVALID_AUDIO)
         
         # Assert
         assert result == {}
     
-    def test_analyze_audio_empty_path(self):
+    def test_analyze_audio_empty_path(self, analyzer):
         """Test analyzing with empty file path"""
-        # Arrange
-        analyzer = AudioAnalyzer()
-        
         # Act
         result = analyzer.analyze_audio("")
         
@@ -77,154 +80,196 @@ class TestAudioAnalyzer:
     
     @patch('librosa.load')
     @patch('librosa.beat.beat_track')
-    def test_get_tempo(self, mock_beat_track, mock_load):
+    def test_get_tempo(self, mock_beat_track, mock_load, analyzer):
         """Test tempo detection"""
         # Arrange
-        mock_y = np.array([0.1, 0.2, 0.3, 0.4])
-        mock_sr = 22050
-        mock_load.return_value = (mock_y, mock_sr)
-        mock_beat_track.return_value = (120.0, np.array([0, 1, 2]))
-        
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
+        mock_beat_track.return_value = (120.0, _MOCK_BEATS)
         
         # Act
-        tempo = analyzer.get_tempo(self.test_audio_short)
+        tempo = analyzer.get_tempo(_TEST_AUDIO_SHORT)
         
         # Assert
         assert tempo == 120.0
-        mock_load.assert_called_once_with(self.test_audio_short)
+        mock_load.assert_called_once_with(
+            _TEST_AUDIO_SHORT, sr=22050, mono=True, res_type='soxr_lq'
+        )
         mock_beat_track.assert_called_once()
     
     @patch('librosa.load')
     @patch('librosa.beat.beat_track')
     @patch('librosa.frames_to_time')
-    def test_get_beats(self, mock_frames_to_time, mock_beat_track, mock_load):
+    def test_get_beats(self, mock_frames_to_time, mock_beat_track, mock_load, analyzer):
         """Test beat detection"""
         # Arrange
-        mock_y = np.array([0.1, 0.2, 0.3, 0.4])
-        mock_sr = 22050
-        mock_load.return_value = (mock_y, mock_sr)
-        mock_beats = np.array([0, 1, 2, 3])
-        mock_beat_track.return_value = (120.0, mock_beats)
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
+        mock_beat_track.return_value = (120.0, _MOCK_BEATS)
         mock_beat_times = np.array([0.5, 1.0, 1.5, 2.0])
         mock_frames_to_time.return_value = mock_beat_times
         
-        analyzer = AudioAnalyzer()
-        
         # Act
-        beats = analyzer.get_beats(self.test_audio_short)
+        beats = analyzer.get_beats(_TEST_AUDIO_SHORT)
         
         # Assert
         assert isinstance(beats, list)
         assert len(beats) == 4
         assert beats == [0.5, 1.0, 1.5, 2.0]
-        mock_load.assert_called_once_with(self.test_audio_short)
+        mock_load.assert_called_once_with(
+            _TEST_AUDIO_SHORT, sr=22050, mono=True, res_type='soxr_lq'
+        )
         mock_beat_track.assert_called_once()
-        mock_frames_to_time.assert_called_once_with(mock_beats, sr=mock_sr)
+        mock_frames_to_time.assert_called_once_with(_MOCK_BEATS, sr=_MOCK_SR)
     
     @patch('librosa.load')
-    def test_get_audio_features(self, mock_load):
+    def test_get_audio_features(self, mock_load, analyzer):
         """Test audio feature extraction"""
         # Arrange
-        mock_y = np.array([0.1, 0.2, 0.3, 0.4])
-        mock_sr = 22050
-        mock_load.return_value = (mock_y, mock_sr)
-        
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
         
         # Act
-        features = analyzer.get_audio_features(self.test_audio_short)
+        features = analyzer.get_audio_features(_TEST_AUDIO_SHORT)
         
         # Assert
         assert isinstance(features, dict)
-        assert 'duration' in features
-        assert 'sample_rate' in features
-        assert 'rms_energy' in features
-        assert 'zero_crossing_rate' in features
-        mock_load.assert_called_once_with(self.test_audio_short)
+        assert {'duration', 'sample_rate', 'rms_energy', 'zero_crossing_rate'} <= features.keys()
+        mock_load.assert_called_once_with(
+            _TEST_AUDIO_SHORT, sr=22050, mono=True, res_type='soxr_lq'
+        )
     
     @patch('librosa.load')
-    def test_librosa_error_handling(self, mock_load):
-        """Test handling of librosa errors"""
+    @patch('librosa.get_duration', side_effect=Exception("Test probe error"))
+    def test_get_audio_features_probe_failure(self, mock_duration, mock_load, analyzer):
+        """Test a failed duration probe falls back to a full load"""
         # Arrange
-        mock_load.side_effect = Exception("Test librosa error")
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
         
         # Act
-        result = analyzer.analyze_audio(self.test_audio_short)
+        features = analyzer.get_audio_features(_TEST_AUDIO_SHORT)
         
         # Assert
-        assert result == {}
+        assert features['sample_rate'] == _MOCK_SR
+        mock_duration.assert_called_once()
+        mock_load.assert_called_once()
+    
+    @pytest.mark.parametrize("method, expected", [
+        ('analyze_audio', {}),
+        ('get_tempo', 0.0),
+        ('get_beats', []),
+        ('get_audio_features', {}),
+    ])
+    def test_librosa_error_handling(self, method, expected, analyzer):
+        """Test each analysis method handles librosa errors"""
+        # Act
+        with patch('librosa.load', side_effect=Exception("Test librosa error")):
+            result = getattr(analyzer, method)(_TEST_AUDIO_SHORT)
+        
+        # Assert
+        assert result == expected
     
     @patch('librosa.load')
-    def test_get_tempo_error_handling(self, mock_load):
-        """Test tempo detection error handling"""
+    @patch('librosa.beat.beat_track')
+    def test_comprehensive_analysis(self, mock_beat_track, mock_load, analyzer):
+        """Test comprehensive audio analysis"""
         # Arrange
-        mock_load.side_effect = Exception("Test error")
-        analyzer = AudioAnalyzer()
+        mock_y = np.array([0.1, -0.2, 0.3, 0.4])
+        mock_sr = 22050
+        mock_load.return_value = (mock_y, mock_sr)
+        mock_beat_track.return_value = (120.0, np.array([0.5, 1.0, 1.5]))
         
         # Act
-        tempo = analyzer.get_tempo(self.test_audio_short)
+        result = analyzer.analyze_audio(_TEST_AUDIO_SHORT)
         
         # Assert
-        assert tempo == 0.0
+        assert {'tempo', 'beats', 'duration', 'sample_rate'} <= result.keys()
+        assert result['tempo'] == 120.0
+        assert len(result['beats']) == 3
+        assert result['sample_rate'] == 22050
+        # rms_energy is whole-signal RMS, not the mean of librosa's framed RMS
+        assert result['rms_energy'] == pytest.approx(np.sqrt(0.075))
+        assert result['zero_crossing_rate'] == pytest.approx(2 / 3)
+        
+        # Verify librosa functions were called
+        mock_load.assert_called_once()
+        mock_beat_track.assert_called_once()
     
     @patch('librosa.load')
-    def test_get_beats_error_handling(self, mock_load):
-        """Test beat detection error handling"""
+    @patch('librosa.beat.beat_track')
+    def test_load_cache_reused_across_methods(
+        self, mock_beat_track, mock_load, analyzer
+    ):
+        """Test audio file is decoded once across analysis methods"""
         # Arrange
-        mock_load.side_effect = Exception("Test error")
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
+        mock_beat_track.return_value = (120.0, np.array([0, 1, 2]))
         
         # Act
-        beats = analyzer.get_beats(self.test_audio_short)
+        analyzer.get_tempo(_TEST_AUDIO_SHORT)
+        analyzer.get_audio_features(_TEST_AUDIO_SHORT)
         
         # Assert
-        assert beats == []
+        mock_load.assert_called_once_with(
+            _TEST_AUDIO_SHORT, sr=22050, mono=True, res_type='soxr_lq'
+        )
+        
+        # Clearing the cache forces a fresh decode
+        analyzer.clear_cache()
+        analyzer.get_tempo(_TEST_AUDIO_SHORT)
+        assert mock_load.call_count == 2
     
     @patch('librosa.load')
-    def test_get_audio_features_error_handling(self, mock_load):
-        """Test audio features error handling"""
+    @patch('librosa.beat.beat_track')
+    def test_accessors_reuse_analysis_results(
+        self, mock_beat_track, mock_load, analyzer
+    ):
+        """Test get_tempo/get_beats and analyze_audio share one beat tracking pass"""
         # Arrange
-        mock_load.side_effect = Exception("Test error")
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
+        mock_beat_track.return_value = (120.0, np.array([0, 1, 2]))
         
         # Act
-        features = analyzer.get_audio_features(self.test_audio_short)
+        tempo = analyzer.get_tempo(_TEST_AUDIO_SHORT)
+        result = analyzer.analyze_audio(_TEST_AUDIO_SHORT)
+        beats = analyzer.get_beats(_TEST_AUDIO_SHORT)
         
         # Assert
-        assert features == {}
+        assert tempo == result['tempo']
+        assert beats == result['beats']
+        mock_beat_track.assert_called_once()
     
     @patch('librosa.load')
     @patch('librosa.beat.beat_track')
-    @patch('librosa.feature.rms')
-    @patch('librosa.feature.zero_crossing_rate')
-    def test_comprehensive_analysis(self, mock_zcr, mock_rms, mock_beat_track, mock_load):
-        """Test comprehensive audio analysis"""
+    def test_cached_beats_are_copied(self, mock_beat_track, mock_load, analyzer):
+        """Test editing returned beats does not change later results"""
         # Arrange
-        mock_y = np.array([0.1, 0.2, 0.3, 0.4])
-        mock_sr = 22050
-        mock_load.return_value = (mock_y, mock_sr)
-        mock_beat_track.return_value = (120.0, np.array([0.5, 1.0, 1.5]))
-        mock_rms.return_value = np.array([[0.2]])
-        mock_zcr.return_value = np.array([[0.1]])
-        
-        analyzer = AudioAnalyzer()
+        mock_load.return_value = (_MOCK_Y, _MOCK_SR)
+        mock_beat_track.return_value = (120.0, np.array([0, 1, 2]))
+        expected = analyzer.get_beats(_TEST_AUDIO_SHORT)
         
         # Act
-        result = analyzer.analyze_audio(self.test_audio_short)
+        analyzer.analyze_audio(_TEST_AUDIO_SHORT)['beats'].append(99.0)
+        analyzer.analyze_audio(_TEST_AUDIO_SHORT)['beats'].clear()
+        analyzer.get_beats(_TEST_AUDIO_SHORT).append(99.0)
         
         # Assert
-        assert 'tempo' in result
-        assert 'beats' in result
-        assert 'duration' in result
-        assert 'sample_rate' in result
-        assert result['tempo'] == 120.0
-        assert len(result['beats']) == 3
-        assert result['sample_rate'] == 22050
+        assert analyzer.analyze_audio(_TEST_AUDIO_SHORT)['beats'] == expected
+        assert analyzer.get_beats(_TEST_AUDIO_SHORT) == expected
+    
+    def test_streamed_features_match_full_load(self, analyzer, monkeypatch):
+        """Test streaming feature extraction agrees with a full load"""
+        # Arrange
+        if not analyzer.is_available():
+            pytest.skip("librosa not installed")
         
-        # Verify all librosa functions were called
-        mock_load.assert_called_once()
-        mock_beat_track.assert_called_once()
-        mock_rms.assert_called_once()
-        mock_zcr.assert_called_once()
+        # Act
+        full = analyzer.get_audio_features(_TEST_AUDIO_MEDIUM)
+        analyzer.clear_cache()
+        monkeypatch.setattr(analyzer, 'STREAM_MIN_DURATION', 0.0)
+        monkeypatch.setattr(analyzer, 'STREAM_BLOCK_FRAMES', 8)  # Force several blocks
+        streamed = analyzer.get_audio_features(_TEST_AUDIO_MEDIUM)
+        
+        # Assert
+        assert streamed['sample_rate'] == full['sample_rate']
+        assert streamed['duration'] == pytest.approx(full['duration'], abs=0.01)
+        assert streamed['rms_energy'] == pytest.approx(full['rms_energy'], rel=0.01)
+        assert streamed['zero_crossing_rate'] == pytest.approx(full['zero_crossing_rate'], rel=0.01)
+        assert streamed['spectral_centroid'] == pytest.approx(full['spectral_centroid'], rel=0.05)
@@ -4,37 +4,23 @@ Unit tests for AudioManager class
 import pytest
 import pygame
 import os
-import sys
-import time
-from unittest.mock import Mock, patch, MagicMock
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from unittest.mock import Mock, patch
 
 from audio.audio_manager import AudioManager
 
+# Test audio files, generated by tests/fixtures/generate_test_audio.py
+_FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
+_TEST_AUDIO_SHORT = os.path.join(_FIXTURES_DIR, 'test_short.wav')
+_TEST_AUDIO_MEDIUM = os.path.join(_FIXTURES_DIR, 'test_medium.wav')
+_INVALID_AUDIO = os.path.join(_FIXTURES_DIR, 'nonexistent.wav')
+
+# The mixer is opened once for this module; see tests/conftest.py
+pytestmark = pytest.mark.usefixtures("mixer_reset")
+
 
 class TestAudioManager:
     """Test cases for AudioManager class"""
     
-    def setup_method(self):
-        """Setup test environment before each test"""
-        # Initialize pygame mixer for testing
-        pygame.mixer.pre_init(buffer=512)  # Small buffer for testing
-        pygame.mixer.init()
-        
-        # Path to test audio files
-        self.fixtures_dir = os.path.join(os.path.dirname(__file__), '..', 'fixtures')
-        self.test_audio_short = os.path.join(self.fixtures_dir, 'test_short.wav')
-        self.test_audio_medium = os.path.join(self.fixtures_dir, 'test_medium.wav')
-        self.invalid_audio = os.path.join(self.fixtures_dir, 'nonexistent.wav')
-        
-    def teardown_method(self):
-        """Cleanup after each test"""
-        # Stop any playing audio and cleanup
-        pygame.mixer.stop()
-        pygame.mixer.quit()
-    
     def test_audio_manager_initialization(self):
         """Test AudioManager initializes correctly"""
         # Act
@@ -60,12 +46,12 @@ class TestAudioManager:
         manager = AudioManager()
         
         # Act
-        result = manager.load_music(self.test_audio_short)
+        result = manager.load_music(_TEST_AUDIO_SHORT)
         
         # Assert
         assert result == True
         assert manager.current_music is not None
-        assert manager.current_file_path == self.test_audio_short
+        assert manager.current_file_path == _TEST_AUDIO_SHORT
     
     def test_load_invalid_audio_file(self):
         """Test loading invalid audio file"""
@@ -73,7 +59,7 @@ class TestAudioManager:
         manager = AudioManager()
         
         # Act
-        result = manager.load_music(self.invalid_audio)
+        result = manager.load_music(_INVALID_AUDIO)
         
         # Assert
         assert result == False
@@ -105,7 +91,7 @@ class TestAudioManager:
         """Test playing music with loaded file"""
         # Arrange
         manager = AudioManager()
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         
         # Act
         manager.play_music()
@@ -118,7 +104,7 @@ class TestAudioManager:
         """Test stopping music playback"""
         # Arrange
         manager = AudioManager()
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         manager.play_music()
         
         # Act
@@ -132,7 +118,7 @@ class TestAudioManager:
         """Test pausing and resuming music"""
         # Arrange
         manager = AudioManager()
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         manager.play_music()
         
         # Act - Pause
@@ -147,39 +133,33 @@ class TestAudioManager:
         # Assert - Resumed
         assert manager.is_paused == False
     
-    def test_volume_control(self):
+    @pytest.mark.parametrize("volume", [0.0, 0.5, 1.0])
+    def test_volume_control(self, volume):
         """Test volume control functionality"""
         # Arrange
         manager = AudioManager()
         
-        # Test valid volume levels
-        test_volumes = [0.0, 0.5, 1.0]
+        # Act
+        manager.set_volume(volume)
         
-        for volume in test_volumes:
-            # Act
-            manager.set_volume(volume)
-            
-            # Assert
-            assert manager.volume == volume
+        # Assert
+        assert manager.volume == volume
     
-    def test_volume_control_invalid_values(self):
-        """Test volume control with invalid values"""
+    @pytest.mark.parametrize("input_volume, expected_volume", [
+        (-0.5, 0.0),  # Below minimum
+        (1.5, 1.0),   # Above maximum
+        (2.0, 1.0),   # Way above maximum
+    ])
+    def test_volume_control_invalid_values(self, input_volume, expected_volume):
+        """Test volume control with invalid values (should be clamped)"""
         # Arrange
         manager = AudioManager()
         
-        # Test invalid volume levels (should be clamped)
-        test_cases = [
-            (-0.5, 0.0),  # Below minimum
-            (1.5, 1.0),   # Above maximum
-            (2.0, 1.0),   # Way above maximum
-        ]
-        
-        for input_volume, expected_volume in test_cases:
-            # Act
-            manager.set_volume(input_volume)
-            
-            # Assert
-            assert manager.volume == expected_volume
+        # Act
+        manager.set_volume(input_volume)
+        
+        # Assert
+        assert manager.volume == expected_volume
     
     def test_get_current_time_not_playing(self):
         """Test getting current time when not playing"""
@@ -196,18 +176,18 @@ class TestAudioManager:
         """Test getting current time while playing"""
         # Arrange
         manager = AudioManager()
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
+        manager._clock = Mock(return_value=1000.0)
         manager.play_music()
         
-        # Wait a small amount of time
-        time.sleep(0.1)
+        # Advance the clock 100ms instead of sleeping
+        manager._clock.return_value = 1100.0
         
         # Act
         current_time = manager.get_current_time()
         
         # Assert
-        assert current_time > 0  # Should be positive after waiting
-        assert current_time < 1000  # Should be less than 1 second
+        assert current_time == pytest.approx(100.0)
         
         # Cleanup
         manager.stop_music()
@@ -216,16 +196,20 @@ class TestAudioManager:
         """Test is_playing status tracking"""
         # Arrange
         manager = AudioManager()
+        manager._clock = Mock(return_value=1000.0)
         
         # Initially not playing
         assert manager.is_playing() == False
         
         # Load and play
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         manager.play_music()
         
-        # Should be playing
-        assert manager.is_playing() == True
+        # Should be playing once the mixer is polled again
+        manager._clock.return_value = 1000.0 + manager.BUSY_CHECK_INTERVAL_MS + 1
+        with patch('pygame.mixer.get_busy', return_value=True), \
+                patch('pygame.mixer.music.get_busy', return_value=False):
+            assert manager.is_playing() == True
         
         # Stop
         manager.stop_music()
@@ -248,7 +232,7 @@ class TestAudioManager:
         """Test getting duration with loaded file"""
         # Arrange
         manager = AudioManager()
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         
         # Act
         duration = manager.get_duration()
@@ -257,11 +241,25 @@ class TestAudioManager:
         # test_short.wav is 1 second long
         assert 900 <= duration <= 1100  # Allow some tolerance (900-1100ms)
     
+    @patch('audio.audio_manager.SOUNDFILE_AVAILABLE', False)
+    def test_get_duration_without_soundfile(self):
+        """Test duration falls back to the decoded sound length"""
+        # Arrange
+        manager = AudioManager()
+        manager.load_music(_TEST_AUDIO_SHORT)
+        
+        # Act
+        duration = manager.get_duration()
+        
+        # Assert
+        assert manager._duration_ms is None
+        assert 900 <= duration <= 1100
+    
     def test_cleanup(self):
         """Test cleanup functionality"""
         # Arrange
         manager = AudioManager()
-        manager.load_music(self.test_audio_short)
+        manager.load_music(_TEST_AUDIO_SHORT)
         manager.play_music()
         
         # Act
@@ -278,18 +276,18 @@ class TestAudioManager:
         manager = AudioManager()
         
         # Load first file
-        result1 = manager.load_music(self.test_audio_short)
+        result1 = manager.load_music(_TEST_AUDIO_SHORT)
         first_file = manager.current_file_path
         
         # Load second file
-        result2 = manager.load_music(self.test_audio_medium)
+        result2 = manager.load_music(_TEST_AUDIO_MEDIUM)
         second_file = manager.current_file_path
         
         # Assert
         assert result1 == True
         assert result2 == True
         assert first_file != second_file
-        assert manager.current_file_path == self.test_audio_medium
+        assert manager.current_file_path == _TEST_AUDIO_MEDIUM
     
     @patch('pygame.mixer.Sound')
     def test_pygame_error_handling(self, mock_sound):
@@ -299,8 +297,111 @@ class TestAudioManager:
         manager = AudioManager()
         
         # Act
-        result = manager.load_music(self.test_audio_short)
+        result = manager.load_music(_TEST_AUDIO_SHORT)
         
         # Assert
         assert result == False
         assert manager.current_music is None
+    
+    def test_mixer_opened_on_first_load(self):
+        """Test mixer is not required until music is loaded"""
+        # Arrange
+        pygame.mixer.quit()
+        manager = AudioManager()
+        
+        # Assert - idle manager works without a mixer
+        assert pygame.mixer.get_init() is None
+        assert manager.is_playing() == False
+        manager.stop_music()
+        manager.cleanup()
+        
+        # Act
+        result = manager.load_music(_TEST_AUDIO_SHORT)
+        
+        # Assert
+        assert result == True
+        assert pygame.mixer.get_init() is not None
+    
+    def test_mixer_opened_with_requested_format(self):
+        """Test mixer parameters are passed through on first load"""
+        # Arrange
+        pygame.mixer.quit()
+        manager = AudioManager(buffer_size=1024, frequency=22050, channels=1)
+        
+        # Act
+        result = manager.load_music(_TEST_AUDIO_SHORT)
+        
+        # Assert
+        assert result == True
+        frequency, _, channels = pygame.mixer.get_init()
+        assert frequency == 22050
+        assert channels == 1
+    
+    def test_is_playing_detects_track_end(self):
+        """Test is_playing notices the mixer finishing on its own"""
+        # Arrange
+        manager = AudioManager()
+        manager.load_music(_TEST_AUDIO_SHORT)
+        manager.play_music()
+        assert manager.is_playing() == True
+        
+        # Act - track ends without stop_music, after the poll interval
+        pygame.mixer.stop()
+        manager._last_busy_check -= manager.BUSY_CHECK_INTERVAL_MS + 1
+        
+        # Assert
+        assert manager.is_playing() == False
+    
+    @patch.object(AudioManager, 'STREAM_MIN_DURATION_MS', 0.0)
+    def test_long_track_is_streamed(self):
+        """Test tracks over the stream threshold play through mixer.music"""
+        # Arrange
+        manager = AudioManager()
+        
+        # Act
+        result = manager.load_music(_TEST_AUDIO_SHORT)
+        manager.play_music()
+        
+        # Assert
+        assert result == True
+        assert not isinstance(manager.current_music, pygame.mixer.Sound)
+        assert 900 <= manager.get_duration() <= 1100
+        assert pygame.mixer.music.get_busy()
+        assert manager.is_playing() == True
+        
+        manager.pause_music()
+        assert manager.is_paused == True
+        
+        manager.stop_music()
+        assert not pygame.mixer.music.get_busy()
+    
+    @patch.object(AudioManager, 'STREAM_MIN_DURATION_MS', 0.0)
+    def test_streamed_time_follows_audio_clock(self):
+        """Test streamed playback time comes from mixer.music.get_pos"""
+        # Arrange
+        manager = AudioManager()
+        manager.load_music(_TEST_AUDIO_SHORT)
+        manager.play_music()
+        
+        # Act
+        with patch('pygame.mixer.music.get_pos', return_value=500):
+            current_time = manager.get_current_time()
+        
+        # Assert - position less one buffer of output latency
+        assert current_time == pytest.approx(500 - manager._output_latency_ms)
+        assert 0 < manager._output_latency_ms < 100
+    
+    def test_set_volume_skips_unchanged_value(self):
+        """Test setting the same volume again does not touch the sound"""
+        # Arrange
+        manager = AudioManager()
+        manager.current_music = Mock()
+        manager.set_volume(0.5)
+        manager.current_music.set_volume.reset_mock()
+        
+        # Act
+        manager.set_volume(0.5)
+        manager.set_volume(0.8)
+        
+        # Assert
+        manager.current_music.set_volume.assert_called_once_with(0.8)
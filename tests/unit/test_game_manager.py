@@ -4,15 +4,31 @@ Unit tests for GameManager class
 
 import pytest
 import pygame
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
-import sys
-import os
-
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "src"))
 
+from audio.audio_manager import AudioManager
 from core.game_manager import GameManager
 
+# Captured before the pg fixture swaps pygame.time.Clock for a Mock
+Clock = pygame.time.Clock
+
+
+@pytest.fixture(autouse=True)
+def pg(monkeypatch):
+    """Replace the pygame calls GameManager makes on start-up"""
+    mocks = SimpleNamespace(
+        init=Mock(), set_mode=Mock(), set_caption=Mock(), clock=Mock(),
+        screen=Mock(spec=pygame.Surface),
+    )
+    mocks.screen.get_size.return_value = (800, 600)
+    mocks.set_mode.return_value = mocks.screen
+    monkeypatch.setattr("pygame.init", mocks.init)
+    monkeypatch.setattr("pygame.display.set_mode", mocks.set_mode)
+    monkeypatch.setattr("pygame.display.set_caption", mocks.set_caption)
+    monkeypatch.setattr("pygame.time.Clock", mocks.clock)
+    return mocks
+
 
 class TestGameManager:
     """Test cases for GameManager class"""
@@ -22,27 +38,13 @@ class TestGameManager:
         # Mock pygame to avoid actual window creation during tests
         self.pygame_mock = Mock()
 
-    def teardown_method(self):
-        """Cleanup after each test"""
-        # Ensure pygame is properly cleaned up
-        if pygame.get_init():
-            pygame.quit()
-
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
     @patch("core.game_manager.AudioManager")
-    def test_game_manager_initialization(
-        self, mock_audio_manager, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_game_manager_initialization(self, mock_audio_manager, pg):
         """Test GameManager initializes correctly"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
-        mock_clock_instance = Mock()
-        mock_clock.return_value = mock_clock_instance
-        mock_audio_instance = Mock()
+        mock_clock_instance = Mock(spec=Clock)
+        pg.clock.return_value = mock_clock_instance
+        mock_audio_instance = Mock(spec=AudioManager)
         mock_audio_manager.return_value = mock_audio_instance
 
         # Act
@@ -52,46 +54,28 @@ class TestGameManager:
         assert (
             manager.running == False
         )  # Should start as False, set to True when run() is called
-        assert manager.screen == mock_screen
+        assert manager.screen == pg.screen
         assert manager.clock == mock_clock_instance
         assert manager.audio_manager == mock_audio_instance
-        mock_init.assert_called_once()
-        mock_display.assert_called_once()
-        mock_caption.assert_called_once_with("Everyday Rhythm")
+        pg.init.assert_called_once()
+        pg.set_mode.assert_called_once()
+        pg.set_caption.assert_called_once_with("Everyday Rhythm")
         mock_audio_manager.assert_called_once()
-        mock_caption.assert_called_once_with("Everyday Rhythm")
-
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
-    def test_game_manager_screen_dimensions(
-        self, mock_clock, mock_caption, mock_display, mock_init
-    ):
-        """Test GameManager creates screen with correct dimensions"""
-        # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
+        pg.set_caption.assert_called_once_with("Everyday Rhythm")
 
+    def test_game_manager_screen_dimensions(self, pg):
+        """Test GameManager creates screen with correct dimensions"""
         # Act
         manager = GameManager()
 
         # Assert
         # Should call set_mode with default dimensions (800, 600)
-        mock_display.assert_called_once_with((800, 600))
+        pg.set_mode.assert_called_once_with((800, 600))
 
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
     @patch("pygame.event.get")
-    def test_handle_events_quit(
-        self, mock_event_get, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_handle_events_quit(self, mock_event_get):
         """Test handling quit events"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
         mock_quit_event = Mock()
         mock_quit_event.type = pygame.QUIT
         mock_event_get.return_value = [mock_quit_event]
@@ -105,18 +89,10 @@ class TestGameManager:
         # Assert
         assert manager.running == False
 
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
     @patch("pygame.event.get")
-    def test_handle_events_space_key(
-        self, mock_event_get, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_handle_events_space_key(self, mock_event_get):
         """Test handling space key events"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
         mock_key_event = Mock()
         mock_key_event.type = pygame.KEYDOWN
         mock_key_event.key = pygame.K_SPACE
@@ -131,19 +107,10 @@ class TestGameManager:
         # Should return True when space key is pressed
         assert result == True
 
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
     @patch("pygame.display.flip")
-    def test_render_basic(
-        self, mock_flip, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_render_basic(self, mock_flip, pg):
         """Test basic rendering functionality"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
-
         manager = GameManager()
 
         # Act
@@ -151,22 +118,13 @@ class TestGameManager:
 
         # Assert
         # Should fill screen with black background
-        mock_screen.fill.assert_called_once_with((0, 0, 0))
+        pg.screen.fill.assert_called_once_with((0, 0, 0))
         # Should call display.flip()
         mock_flip.assert_called_once()
 
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
-    def test_update_method_exists(
-        self, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_update_method_exists(self):
         """Test update method exists and can be called"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
-
         manager = GameManager()
 
         # Act & Assert
@@ -174,17 +132,11 @@ class TestGameManager:
         manager.update()
         assert True  # If we get here, update() method exists and works
 
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
-    def test_fps_target(self, mock_clock, mock_caption, mock_display, mock_init):
+    def test_fps_target(self, pg):
         """Test FPS target is set correctly"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
-        mock_clock_instance = Mock()
-        mock_clock.return_value = mock_clock_instance
+        mock_clock_instance = Mock(spec=Clock)
+        pg.clock.return_value = mock_clock_instance
 
         manager = GameManager()
 
@@ -195,21 +147,13 @@ class TestGameManager:
         # Should call clock.tick with 60 FPS
         mock_clock_instance.tick.assert_called_once_with(60)
     
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
     @patch("core.game_manager.AudioManager")
-    def test_audio_integration(
-        self, mock_audio_manager, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_audio_integration(self, mock_audio_manager, pg):
         """Test GameManager audio integration"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
-        mock_clock_instance = Mock()
-        mock_clock.return_value = mock_clock_instance
-        mock_audio_instance = Mock()
+        mock_clock_instance = Mock(spec=Clock)
+        pg.clock.return_value = mock_clock_instance
+        mock_audio_instance = Mock(spec=AudioManager)
         mock_audio_manager.return_value = mock_audio_instance
         
         manager = GameManager()
@@ -227,19 +171,11 @@ class TestGameManager:
         manager.set_volume(0.5)
         mock_audio_instance.set_volume.assert_called_once_with(0.5)
     
-    @patch("pygame.init")
-    @patch("pygame.display.set_mode")
-    @patch("pygame.display.set_caption")
-    @patch("pygame.time.Clock")
     @patch("core.game_manager.AudioManager")
-    def test_cleanup_with_audio(
-        self, mock_audio_manager, mock_clock, mock_caption, mock_display, mock_init
-    ):
+    def test_cleanup_with_audio(self, mock_audio_manager):
         """Test cleanup includes audio cleanup"""
         # Arrange
-        mock_screen = Mock()
-        mock_display.return_value = mock_screen
-        mock_audio_instance = Mock()
+        mock_audio_instance = Mock(spec=AudioManager)
         mock_audio_manager.return_value = mock_audio_instance
         
         manager = GameManager()
@@ -249,3 +185,93 @@ class TestGameManager:
         
         # Assert
         mock_audio_instance.cleanup.assert_called_once()
+    
+    @patch("pygame.font.Font")
+    @patch("core.game_manager.UIRenderer")
+    @patch("core.game_manager.AudioManager")
+    def test_debug_text_reused_across_frames(
+        self, mock_audio_manager, mock_ui_renderer, mock_font
+    ):
+        """Test debug overlay builds its font once and reuses rendered lines"""
+        # Arrange
+        mock_audio_manager.return_value.current_music = None
+        
+        manager = GameManager()
+        
+        # Act
+        manager._render_debug_info()
+        manager._render_debug_info()
+        
+        # Assert - one font, each distinct line rendered only once
+        mock_font.assert_called_once_with(None, 24)
+        rendered = [c.args[0] for c in mock_font.return_value.render.call_args_list]
+        assert len(rendered) == len(set(rendered))
+        assert "No audio loaded" in rendered
+    
+    @patch("pygame.event.get")
+    @patch("core.game_manager.UIRenderer")
+    @patch("core.game_manager.AudioManager")
+    def test_handle_events_escape_dispatch(
+        self, mock_audio_manager, mock_ui_renderer, mock_event_get
+    ):
+        """Test ESC leaves rhythm mode first, then quits from the menu"""
+        # Arrange
+        mock_key_event = Mock()
+        mock_key_event.type = pygame.KEYDOWN
+        mock_key_event.key = pygame.K_ESCAPE
+        mock_event_get.return_value = [mock_key_event]
+        
+        manager = GameManager()
+        manager.running = True
+        manager.in_rhythm_mode = True
+        manager.rhythm_engine = Mock()
+        
+        # Act & Assert - first ESC ends rhythm mode
+        assert manager.handle_events() == False
+        manager.rhythm_engine.end_game.assert_called_once()
+        assert manager.in_rhythm_mode == False
+        assert manager.running == True
+        
+        # Act & Assert - second ESC quits
+        manager.handle_events()
+        assert manager.running == False
+    
+    @patch("pygame.display.flip")
+    @patch("core.game_manager.UIRenderer")
+    def test_render_menu_skips_unchanged_frame(self, mock_ui_renderer, mock_flip, pg):
+        """Test an unchanged menu frame is not redrawn or flipped"""
+        # Arrange
+        manager = GameManager()
+        
+        # Act
+        manager.render()
+        manager.render()
+        
+        # Assert
+        pg.screen.fill.assert_called_once_with((0, 0, 0))
+        mock_flip.assert_called_once()
+    
+    @patch("pygame.event.get")
+    @patch("pygame.display.flip")
+    @patch("core.game_manager.UIRenderer")
+    def test_expose_event_forces_redraw(
+        self, mock_ui_renderer, mock_flip, mock_event_get, pg
+    ):
+        """Test an exposed window redraws the unchanged menu frame"""
+        # Arrange
+        mock_expose_event = Mock()
+        mock_expose_event.type = pygame.WINDOWEXPOSED
+        mock_event_get.return_value = [mock_expose_event]
+        
+        manager = GameManager()
+        manager.render()
+        
+        # Act
+        manager.handle_events()
+        manager.render()
+        
+        # Assert
+        assert pygame.WINDOWEXPOSED in mock_event_get.call_args.args[0]
+        assert pg.screen.fill.call_count == 2
+        assert mock_flip.call_count == 2
+        mock_ui_renderer.return_value.invalidate.assert_called_once()
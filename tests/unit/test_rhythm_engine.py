@@ -2,44 +2,52 @@
 Unit tests for RhythmEngine class
 """
 import pytest
-import os
-import sys
 from unittest.mock import Mock, patch
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
-
 from core.rhythm_engine import RhythmEngine
 from audio.audio_manager import AudioManager
 from audio.audio_analyzer import AudioAnalyzer
+from gameplay.note import Note
+
+
+@pytest.fixture
+def mock_audio_manager():
+    """AudioManager mock limited to the real AudioManager API"""
+    return Mock(spec=AudioManager)
+
+
+@pytest.fixture
+def mock_audio_analyzer():
+    """AudioAnalyzer mock limited to the real AudioAnalyzer API"""
+    return Mock(spec=AudioAnalyzer)
+
+
+@pytest.fixture
+def engine(mock_audio_manager, mock_audio_analyzer):
+    """RhythmEngine wired to the audio mocks"""
+    return RhythmEngine(mock_audio_manager, mock_audio_analyzer)
 
 
 class TestRhythmEngine:
     """Test cases for RhythmEngine class"""
     
-    def setup_method(self):
-        """Setup test environment before each test"""
-        self.mock_audio_manager = Mock(spec=AudioManager)
-        self.mock_audio_analyzer = Mock(spec=AudioAnalyzer)
-    
-    def test_rhythm_engine_initialization(self):
+    def test_rhythm_engine_initialization(self, mock_audio_manager, mock_audio_analyzer):
         """Test RhythmEngine initializes correctly"""
         # Act
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
+        engine = RhythmEngine(mock_audio_manager, mock_audio_analyzer)
         
         # Assert
-        assert engine.audio_manager == self.mock_audio_manager
-        assert engine.audio_analyzer == self.mock_audio_analyzer
+        assert engine.audio_manager == mock_audio_manager
+        assert engine.audio_analyzer == mock_audio_analyzer
         assert engine.notes == []
         assert engine.score == 0
         assert engine.is_playing == False
     
-    def test_start_game_success(self):
+    def test_start_game_success(self, engine, mock_audio_manager, mock_audio_analyzer):
         """Test successful game start"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
-        self.mock_audio_manager.load_music.return_value = True
-        self.mock_audio_analyzer.get_beats.return_value = [1.0, 2.0, 3.0]
+        mock_audio_manager.load_music.return_value = True
+        mock_audio_analyzer.get_beats.return_value = [1.0, 2.0, 3.0]
         
         # Act
         result = engine.start_game("test.wav")
@@ -48,14 +56,26 @@ class TestRhythmEngine:
         assert result == True
         assert engine.is_playing == True
         assert len(engine.notes) == 3
-        self.mock_audio_manager.load_music.assert_called_once_with("test.wav")
-        self.mock_audio_manager.play_music.assert_called_once()
+        mock_audio_manager.load_music.assert_called_once_with("test.wav")
+        mock_audio_manager.play_music.assert_called_once()
     
-    def test_start_game_audio_load_failure(self):
+    def test_start_game_fallback_notes(self, engine, mock_audio_manager, mock_audio_analyzer):
+        """Test a fallback chart is used when no beats are detected"""
+        # Arrange
+        mock_audio_manager.load_music.return_value = True
+        mock_audio_analyzer.get_beats.return_value = []
+        
+        # Act
+        result = engine.start_game("test.wav")
+        
+        # Assert - one note per second for 10 seconds
+        assert result == True
+        assert [note.hit_time for note in engine.notes] == [i * 1000.0 for i in range(1, 11)]
+    
+    def test_start_game_audio_load_failure(self, engine, mock_audio_manager):
         """Test game start with audio load failure"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
-        self.mock_audio_manager.load_music.return_value = False
+        mock_audio_manager.load_music.return_value = False
         
         # Act
         result = engine.start_game("invalid.wav")
@@ -63,97 +83,206 @@ class TestRhythmEngine:
         # Assert
         assert result == False
         assert engine.is_playing == False
-        self.mock_audio_manager.play_music.assert_not_called()
+        mock_audio_manager.play_music.assert_not_called()
     
-    def test_process_input_perfect_timing(self):
-        """Test perfect timing input processing"""
+    @pytest.mark.parametrize("input_time, expected", [
+        (1020.0, 'perfect'),  # 20ms late
+        (1040.0, 'good'),     # 40ms late
+        (1080.0, None),       # 80ms late (miss): Miss範囲外は None を返す
+    ])
+    def test_process_input_timing(self, engine, input_time, expected):
+        """Test input timing is judged against the note"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
-        self.mock_audio_manager.get_current_time.return_value = 1.02  # 20ms after note
-        # 期待される実装: ノート追加とPerfect判定
+        engine.add_note(Note(hit_time=1000.0))  # Use milliseconds
+        
+        # Act
+        result = engine.process_input(input_time=input_time)
+        
+        # Assert
+        if expected is None:
+            assert result is None
+        else:
+            assert result is not None
+            assert result.judgment == expected
+            assert abs(result.timing_diff - (input_time - 1000.0)) < 5.0
+    
+    def test_update_removes_expired_notes(self, engine):
+        """Test that update removes expired notes and creates miss judgments"""
+        # Arrange
+        current_time = 1.1  # 100ms after note timing
+        # 期待される実装: 期限切れノートのMiss処理
         
         # Act & Assert - 実装完了により有効化
-        from gameplay.note import Note
         note = Note(hit_time=1000.0)  # Use milliseconds
         engine.add_note(note)
-        result = engine.process_input(input_time=1020.0)  # 20ms late
-        assert result is not None
+        engine.is_playing = True  # Set playing state
+        miss_results = engine.update(current_time=1.1)  # 1.1 seconds = 1100ms
+        assert len(miss_results) == 1
+        assert miss_results[0].judgment == 'miss'
+    
+    def test_process_input_with_unsorted_notes(self, engine):
+        """Test notes added out of order are judged against the closest one"""
+        # Arrange
+        for hit_time in (3000.0, 1000.0, 2000.0, 1030.0):
+            engine.add_note(Note(hit_time=hit_time))
+        
+        # Act
+        result = engine.process_input(input_time=1020.0)
+        
+        # Assert - 1030ms note is closest, notes stay sorted
+        assert [note.hit_time for note in engine.notes] == [1000.0, 1030.0, 2000.0, 3000.0]
         assert result.judgment == 'perfect'
-        assert abs(result.timing_diff - 20.0) < 5.0
+        assert abs(result.timing_diff + 10.0) < 1e-6
+        assert engine.notes[1].is_judged
+        assert not engine.notes[0].is_judged
     
-    def test_process_input_good_timing(self):
-        """Test good timing input processing"""
+    def test_assigning_notes_rebuilds_index(self, engine):
+        """Test assigning the notes list sorts it and resets the lookup cursor"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
-        self.mock_audio_manager.get_current_time.return_value = 1.04  # 40ms after note
-        # 期待される実装: ノート追加とGood判定
+        engine.add_note(Note(hit_time=500.0))
+        engine.process_input(input_time=500.0)
         
-        # Act & Assert - 実装完了により有効化
-        from gameplay.note import Note
-        note = Note(hit_time=1000.0)  # Use milliseconds
-        engine.add_note(note)
-        result = engine.process_input(input_time=1040.0)  # 40ms late
+        # Act
+        engine.notes = [Note(hit_time=2000.0), Note(hit_time=1000.0)]
+        result = engine.process_input(input_time=1010.0)
+        
+        # Assert
+        assert [note.hit_time for note in engine.notes] == [1000.0, 2000.0]
+        assert result.judgment == 'perfect'
+        assert engine.notes[0].is_judged
+    
+    def test_update_only_misses_notes_past_window(self, engine):
+        """Test update misses each expired note once and leaves later notes"""
+        # Arrange
+        for hit_time in (1000.0, 1500.0, 3000.0):
+            engine.add_note(Note(hit_time=hit_time))
+        engine.is_playing = True
+        
+        # Act
+        first = engine.update(current_time=2.0)
+        second = engine.update(current_time=2.5)
+        
+        # Assert
+        assert len(first) == 2
+        assert second == []
+        assert not engine.notes[2].is_judged
+        assert engine.process_input(input_time=3010.0).judgment == 'perfect'
+    
+    def test_get_active_notes_window(self, engine):
+        """Test visible notes are the unjudged ones from -100ms to +2s"""
+        # Arrange
+        for hit_time in (800.0, 950.0, 1000.0, 2500.0, 3000.0, 3100.0):
+            engine.add_note(Note(hit_time=hit_time))
+        engine.notes[2].is_judged = True
+        
+        # Act
+        visible = engine.get_active_notes(1000.0)
+        
+        # Assert
+        assert [note.hit_time for note in visible] == [950.0, 2500.0, 3000.0]
+    
+    def test_combo_multiplier_steps(self, engine):
+        """Test combo multiplier thresholds at 10 and 20"""
+        # Arrange
+        expected = {0: 1.0, 9: 1.0, 10: 1.1, 19: 1.1, 20: 1.2, 500: 1.2}
+        
+        # Act & Assert
+        for combo, multiplier in expected.items():
+            engine.combo = combo
+            assert engine._get_combo_multiplier() == multiplier
+    
+    def test_score_and_stats_per_judgment(self, engine):
+        """Test each judgment updates score, combo and counters"""
+        # Arrange
+        engine.combo = 10
+        
+        # Act
+        engine._update_score_new('perfect')
+        engine._update_score_new('good')
+        engine._update_score_new('miss')
+        
+        # Assert - multiplier 1.1 applies at combo 10 and 11
+        assert engine.score == int(1000 * 1.1) + int(500 * 1.1)
+        assert (engine.perfect_count, engine.good_count, engine.miss_count) == (1, 1, 1)
+        assert (engine.perfect_hits, engine.good_hits, engine.misses) == (1, 1, 1)
+        assert engine.combo == 0
+        assert engine.max_combo == 12
+    
+    def test_custom_timing_window(self, engine):
+        """Test judgments follow a replaced timing window"""
+        # Arrange
+        engine.add_note(Note(hit_time=1000.0))
+        
+        # Act
+        engine.timing_window = {"perfect": 10.0, "good": 100.0}
+        result = engine.process_input(input_time=1080.0)
+        
+        # Assert - 80ms is outside the default window but inside the new one
         assert result is not None
         assert result.judgment == 'good'
-        assert abs(result.timing_diff - 40.0) < 5.0
+        assert engine._judge_timing(10.0) == 'perfect'
+        assert engine._judge_timing(101.0) == 'miss'
     
-    def test_process_input_miss_timing(self):
-        """Test miss timing input processing"""
+    def test_timing_window_is_read_only(self, engine):
+        """Test in-place edits of the timing window fail instead of being ignored"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
-        self.mock_audio_manager.get_current_time.return_value = 1.08  # 80ms after note
-        # 期待される実装: Miss判定
+        window = {"perfect": 10.0, "good": 100.0}
+        engine.timing_window = window
         
-        # Act & Assert - 実装完了により有効化
-        from gameplay.note import Note
-        note = Note(hit_time=1000.0)  # Use milliseconds
-        engine.add_note(note)
-        result = engine.process_input(input_time=1080.0)  # 80ms late (miss)
-        assert result is None  # Miss範囲外は None を返す
+        # Act & Assert
+        with pytest.raises(TypeError):
+            engine.timing_window["good"] = 150.0
+        window["good"] = 150.0
+        assert engine.timing_window["good"] == 100.0
+        assert engine._judge_timing(120.0) == 'miss'
     
-    def test_update_removes_expired_notes(self):
-        """Test that update removes expired notes and creates miss judgments"""
+    def test_judge_batch_matches_live_judgment(self, mock_audio_manager, mock_audio_analyzer):
+        """Test batch judgments agree with process_input note by note"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
-        current_time = 1.1  # 100ms after note timing
-        # 期待される実装: 期限切れノートのMiss処理
+        hit_times = [1000.0, 2000.0, 3000.0, 4000.0]
+        input_times = [1010.0, 2040.0, 2930.0, 4000.0]
+        batch_engine = RhythmEngine(mock_audio_manager, mock_audio_analyzer)
+        live_engine = RhythmEngine(mock_audio_manager, mock_audio_analyzer)
+        for hit_time in hit_times:
+            batch_engine.add_note(Note(hit_time=hit_time))
+            live_engine.add_note(Note(hit_time=hit_time))
         
-        # Act & Assert - 実装完了により有効化
-        from gameplay.note import Note
-        note = Note(hit_time=1000.0)  # Use milliseconds
-        engine.add_note(note)
-        engine.is_playing = True  # Set playing state
-        miss_results = engine.update(current_time=1.1)  # 1.1 seconds = 1100ms
-        assert len(miss_results) == 1
-        assert miss_results[0].judgment == 'miss'
+        # Act
+        batch = batch_engine.judge_batch(input_times)
+        live = []
+        for input_time in input_times:
+            result = live_engine.process_input(input_time=input_time)
+            live.append(result.judgment if result else 'miss')
+        
+        # Assert
+        assert list(batch) == live == ['perfect', 'good', 'miss', 'perfect']
+        assert not any(note.is_judged for note in batch_engine.notes)
     
-    def test_score_calculation_with_combo(self):
+    def test_score_calculation_with_combo(self, engine):
         """Test score calculation with combo multiplier"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
         # 期待される実装: コンボによるスコア倍率
         
         # Act & Assert - 実装後に有効化
         # # 10連続Perfect（コンボ倍率1.1倍）
         # for i in range(10):
         #     engine.add_note(Note(timing=i + 1.0))
-        #     self.mock_audio_manager.get_current_time.return_value = i + 1.02
+        #     mock_audio_manager.get_current_time.return_value = i + 1.02
         #     result = engine.process_input()
         #     assert result.judgment == 'perfect'
         # 
         # expected_score = 1000 * 9 + int(1000 * 1.1)  # 最後の1つは1.1倍
         # assert engine.get_score() == expected_score
     
-    def test_clear_resets_all_state(self):
+    def test_clear_resets_all_state(self, engine):
         """Test that clear resets all engine state"""
         # Arrange
-        engine = RhythmEngine(self.mock_audio_manager, self.mock_audio_analyzer)
         # 期待される実装: すべての状態リセット
         
         # Act & Assert - 実装後に有効化
         # # 何らかの状態を設定
         # engine.add_note(Note(timing=1.0))
-        # self.mock_audio_manager.get_current_time.return_value = 1.02
+        # mock_audio_manager.get_current_time.return_value = 1.02
         # engine.process_input()  # スコア・コンボを設定
         # 
         # # クリア前の確認
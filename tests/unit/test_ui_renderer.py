@@ -6,44 +6,83 @@ TDD (Test-Driven Development) アプローチに従って作成されていま
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch
 import pygame
-import sys
-import os
-
-# テスト対象のモジュールをインポートパスに追加
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
 
 from ui.ui_renderer import UIRenderer
-from utils.config import Config
 from gameplay.note import Note
 from core.rhythm_engine import JudgmentResult
 
 
+# 描画テストで共有する判定結果（UIRenderer は内容を変更しない）
+_PERFECT_RESULT = JudgmentResult('perfect', 15.0, 100, 1.1)
+_GOOD_RESULT = JudgmentResult('good', 35.0, 50, 1.0)
+_MISS_RESULT = JudgmentResult('miss', 100.0, 0, 1.0)
+
+# モックフォントが返す共有テキストサーフェス（get_rect が本物の Rect を返す）
+_TEXT_SURFACE = pygame.Surface((1, 1))
+
+
+class FakeSurface(pygame.Surface):
+    """呼び出しを記録する画面サーフェス
+
+    pygame.draw に渡せる本物の Surface で、UIRenderer が呼ぶ転送系メソッドだけをモックにする
+    """
+
+    def __init__(self, size=(800, 600)):
+        super().__init__(size)
+        self.fill = Mock()
+        self.blit = Mock()
+        self.blits = Mock()
+
+
 class TestUIRenderer(unittest.TestCase):
     """UIRenderer クラスのテストケース"""
 
+    @classmethod
+    def setUpClass(cls):
+        """テストクラス全体で一度だけ Pygame の初期化をモック"""
+        cls._pygame_patchers = [
+            patch('pygame.init'),
+            patch.multiple('pygame.font', init=DEFAULT, Font=DEFAULT),
+        ]
+        for patcher in cls._pygame_patchers:
+            patcher.start()
+        
+        # 判定フィードバックの時刻は各テストで mock_ticks.return_value に設定
+        ticks_patcher = patch('pygame.time.get_ticks', return_value=0)
+        cls.mock_ticks = ticks_patcher.start()
+        cls._pygame_patchers.append(ticks_patcher)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Pygame のモックを元に戻す"""
+        for patcher in reversed(cls._pygame_patchers):
+            patcher.stop()
+
     def setUp(self):
         """各テストの前に実行される初期化処理"""
-        # Pygame の初期化をモック
-        with patch('pygame.init'), \
-             patch('pygame.font.init'), \
-             patch('pygame.font.Font'):
-            
-            # モックサーフェスを作成
-            self.mock_screen = Mock(spec=pygame.Surface)
-            self.mock_screen.get_size.return_value = (800, 600)
-            self.mock_screen.fill = Mock()
-            self.mock_screen.blit = Mock()
-            
-            # モック設定を作成
-            self.mock_config = Mock(spec=Config)
-            self.mock_config.SCREEN_WIDTH = 800
-            self.mock_config.SCREEN_HEIGHT = 600
-            self.mock_config.FPS = 60
-            
-            # UIRenderer を初期化
-            self.ui_renderer = UIRenderer(self.mock_screen, self.mock_config)
+        self.mock_ticks.return_value = 0
+        
+        # モックサーフェスを作成
+        self.mock_screen = FakeSurface()
+        
+        # モック設定を作成
+        self.mock_config = SimpleNamespace(SCREEN_WIDTH=800, SCREEN_HEIGHT=600, FPS=60)
+        
+        # UIRenderer を初期化
+        self.ui_renderer = UIRenderer(self.mock_screen, self.mock_config)
+        
+        # 3種類のフォントをモック
+        self.mock_font = Mock()
+        self.mock_font_large = Mock()
+        self.mock_font_small = Mock()
+        for mock_font in (self.mock_font, self.mock_font_large, self.mock_font_small):
+            mock_font.render.return_value = _TEXT_SURFACE
+        self.ui_renderer.font = self.mock_font
+        self.ui_renderer.font_large = self.mock_font_large
+        self.ui_renderer.font_small = self.mock_font_small
 
     def test_init(self):
         """UIRenderer の初期化テスト"""
@@ -110,38 +149,61 @@ class TestUIRenderer(unittest.TestCase):
         notes = [note]
         current_time = 0.0
         
-        with patch('pygame.draw.circle') as mock_draw_circle:
-            # ノートを描画
-            self.ui_renderer.render_notes(notes, current_time)
-            
-            # 円が描画されることを確認
-            mock_draw_circle.assert_called_once()
-            
-            # 描画位置と色を確認
-            args = mock_draw_circle.call_args
-            surface, color, center, radius = args[0]
-            
-            self.assertEqual(surface, self.mock_screen)
-            self.assertEqual(color, (255, 255, 255))  # 白色
-            self.assertEqual(center, (400, 60))       # 初期位置
-            self.assertEqual(radius, 20)              # ノートサイズ
+        # ノートを描画
+        self.ui_renderer.render_notes(notes, current_time)
+        
+        # ノート画像が1回の一括転送で1つ描画されることを確認
+        self.mock_screen.blits.assert_called_once()
+        blit_sequence = self.mock_screen.blits.call_args[0][0]
+        self.assertEqual(len(blit_sequence), 1)
+        
+        # 描画位置を確認（画像の左上 = ノート中心 - (半径 + 縁1px)）
+        sprite, position = blit_sequence[0]
+        x, y = self.ui_renderer.calculate_note_position(note, current_time)
+        self.assertEqual(position, (x - 21, y - 21))
+        
+        # ノート画像の色とサイズを確認
+        self.assertEqual(sprite.get_size(), (42, 42))             # 半径20のノート
+        self.assertEqual(sprite.get_at((21, 21))[:3], (255, 255, 255))  # 白色
 
     def test_render_notes_multiple_notes(self):
         """複数ノートの描画テスト"""
-        # テスト用ノートを作成
+        # 画面内に収まるテスト用ノートを作成
         notes = [
             Note(hit_time=1000.0),
-            Note(hit_time=2000.0),
-            Note(hit_time=3000.0)
+            Note(hit_time=1500.0),
+            Note(hit_time=2000.0)
         ]
         current_time = 0.0
         
-        with patch('pygame.draw.circle') as mock_draw_circle:
-            # ノートを描画
-            self.ui_renderer.render_notes(notes, current_time)
-            
-            # 3つの円が描画されることを確認
-            self.assertEqual(mock_draw_circle.call_count, 3)
+        # ノートを描画
+        self.ui_renderer.render_notes(notes, current_time)
+        
+        # 3つのノートが1回の一括転送で描画されることを確認
+        self.mock_screen.blits.assert_called_once()
+        self.assertEqual(len(self.mock_screen.blits.call_args[0][0]), 3)
+
+    def test_render_notes_blits_sprite_batch(self):
+        """可視ノートがノート画像の一括転送で描画されるテスト"""
+        notes = [
+            Note(hit_time=1000.0),
+            Note(hit_time=2000.0),
+            Note(hit_time=-5000.0),  # 画面外
+        ]
+        
+        self.ui_renderer.render_notes(notes, 0.0)
+        self.ui_renderer.render_notes(notes, 0.0)
+        
+        sprite = self.ui_renderer._note_sprite
+        self.assertEqual(sprite.get_size(), (42, 42))
+        
+        # 2回とも同じノート画像が画面内の2ノート分だけ転送される
+        self.assertEqual(self.mock_screen.blits.call_count, 2)
+        blit_sequence = self.mock_screen.blits.call_args[0][0]
+        x, y = self.ui_renderer.calculate_note_position(notes[0], 0.0)
+        self.assertEqual(len(blit_sequence), 2)
+        self.assertIs(blit_sequence[0][0], sprite)
+        self.assertEqual(blit_sequence[0][1], (x - 21, y - 21))
 
     def test_render_score_display(self):
         """スコア表示のテスト"""
@@ -149,112 +211,97 @@ class TestUIRenderer(unittest.TestCase):
         combo = 25
         multiplier = 1.2
         
-        with patch.object(self.ui_renderer, 'font') as mock_font:
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
-            # スコアを描画
-            self.ui_renderer.render_score(score, combo, multiplier)
-            
-            # フォントレンダリングが呼び出されることを確認
-            self.assertGreater(mock_font.render.call_count, 0)
-            
-            # 画面への描画が呼び出されることを確認
-            self.assertGreater(self.mock_screen.blit.call_count, 0)
+        # スコアを描画
+        self.ui_renderer.render_score(score, combo, multiplier)
+        
+        # フォントレンダリングが呼び出されることを確認
+        self.assertGreater(self.mock_font.render.call_count, 0)
+        
+        # 画面への描画が呼び出されることを確認
+        self.assertGreater(self.mock_screen.blit.call_count, 0)
+
+    def test_render_score_reuses_text_surfaces(self):
+        """スコア表示が変わらない場合はテキストを再描画しないテスト"""
+        self.ui_renderer.render_score(100, 5, 1.0)
+        first_count = self.mock_font.render.call_count
+        self.ui_renderer.render_score(100, 5, 1.0)
+        
+        # 同じ文字列はキャッシュから描画される
+        self.assertEqual(self.mock_font.render.call_count, first_count)
+        
+        # スコアが変わった行だけ再描画される
+        self.ui_renderer.render_score(200, 5, 1.0)
+        self.assertEqual(self.mock_font.render.call_count, first_count + 1)
+
+    def test_text_cache_is_bounded(self):
+        """テキストキャッシュが上限を超えないテスト"""
+        font = Mock()
+        font.render = Mock(return_value=Mock())
+        
+        for i in range(UIRenderer.TEXT_CACHE_SIZE + 10):
+            self.ui_renderer._render_text(font, str(i), (255, 255, 255))
+        
+        self.assertEqual(len(self.ui_renderer._text_cache), UIRenderer.TEXT_CACHE_SIZE)
 
     def test_render_judgment_perfect(self):
         """Perfect判定の描画テスト"""
-        # Perfect判定結果を作成
-        judgment_result = JudgmentResult(
-            judgment='perfect',
-            timing_diff=15.0,
-            score_gained=100,
-            combo_multiplier=1.1
-        )
-        
-        with patch.object(self.ui_renderer, 'font') as mock_font:
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
-            # 判定結果を描画
-            self.ui_renderer.render_judgment(judgment_result)
-            
-            # フォントレンダリングが呼び出されることを確認
-            mock_font.render.assert_called()
-            
-            # 緑色でPerfectが表示されることを確認
-            call_args = mock_font.render.call_args_list
-            text_calls = [call[0][0] for call in call_args]
-            
-            self.assertIn('Perfect!', text_calls)
+        judgment_result = _PERFECT_RESULT
+        
+        # 判定結果を描画
+        self.ui_renderer.render_judgment(judgment_result)
+        
+        # フォントレンダリングが呼び出されることを確認
+        self.mock_font_large.render.assert_called()
+        
+        # 緑色でPerfectが表示されることを確認
+        call_args = self.mock_font_large.render.call_args_list
+        text_calls = [call[0][0] for call in call_args]
+        
+        self.assertIn('Perfect!', text_calls)
 
     def test_render_judgment_good(self):
         """Good判定の描画テスト"""
-        # Good判定結果を作成
-        judgment_result = JudgmentResult(
-            judgment='good',
-            timing_diff=35.0,
-            score_gained=50,
-            combo_multiplier=1.0
-        )
-        
-        with patch.object(self.ui_renderer, 'font') as mock_font:
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
-            # 判定結果を描画
-            self.ui_renderer.render_judgment(judgment_result)
-            
-            # フォントレンダリングが呼び出されることを確認
-            mock_font.render.assert_called()
-            
-            # 黄色でGoodが表示されることを確認
-            call_args = mock_font.render.call_args_list
-            text_calls = [call[0][0] for call in call_args]
-            
-            self.assertIn('Good!', text_calls)
+        judgment_result = _GOOD_RESULT
+        
+        # 判定結果を描画
+        self.ui_renderer.render_judgment(judgment_result)
+        
+        # フォントレンダリングが呼び出されることを確認
+        self.mock_font_large.render.assert_called()
+        
+        # 黄色でGoodが表示されることを確認
+        call_args = self.mock_font_large.render.call_args_list
+        text_calls = [call[0][0] for call in call_args]
+        
+        self.assertIn('Good!', text_calls)
 
     def test_render_judgment_miss(self):
         """Miss判定の描画テスト"""
-        # Miss判定結果を作成
-        judgment_result = JudgmentResult(
-            judgment='miss',
-            timing_diff=100.0,
-            score_gained=0,
-            combo_multiplier=1.0
-        )
-        
-        with patch.object(self.ui_renderer, 'font') as mock_font:
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
-            # 判定結果を描画
-            self.ui_renderer.render_judgment(judgment_result)
-            
-            # フォントレンダリングが呼び出されることを確認
-            mock_font.render.assert_called()
-            
-            # 赤色でMissが表示されることを確認
-            call_args = mock_font.render.call_args_list
-            text_calls = [call[0][0] for call in call_args]
-            
-            self.assertIn('Miss!', text_calls)
+        judgment_result = _MISS_RESULT
+        
+        # 判定結果を描画
+        self.ui_renderer.render_judgment(judgment_result)
+        
+        # フォントレンダリングが呼び出されることを確認
+        self.mock_font_large.render.assert_called()
+        
+        # 赤色でMissが表示されることを確認
+        call_args = self.mock_font_large.render.call_args_list
+        text_calls = [call[0][0] for call in call_args]
+        
+        self.assertIn('Miss!', text_calls)
 
     def test_render_game_info(self):
         """ゲーム情報表示のテスト"""
         music_name = "Test Song"
         progress = 0.5  # 50%進行
         
-        with patch.object(self.ui_renderer, 'font') as mock_font:
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
-            # ゲーム情報を描画
-            self.ui_renderer.render_game_info(music_name, progress)
-            
-            # 音楽名とプログレスバーが描画されることを確認
-            self.assertGreater(mock_font.render.call_count, 0)
-            self.assertGreater(self.mock_screen.blit.call_count, 0)
+        # ゲーム情報を描画
+        self.ui_renderer.render_game_info(music_name, progress)
+        
+        # 音楽名とプログレスバーが描画されることを確認
+        self.assertGreater(self.mock_font.render.call_count, 0)
+        self.assertGreater(self.mock_screen.blit.call_count, 0)
 
     def test_render_judgment_line(self):
         """判定ライン描画のテスト"""
@@ -277,33 +324,35 @@ class TestUIRenderer(unittest.TestCase):
 
     def test_render_pause_overlay(self):
         """一時停止画面の描画テスト"""
-        with patch.object(self.ui_renderer, 'font') as mock_font:
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
-            # 一時停止画面を描画
-            self.ui_renderer.render_pause_overlay()
-            
-            # 半透明オーバーレイと"PAUSED"テキストが描画されることを確認
-            self.assertGreater(self.mock_screen.blit.call_count, 0)
-            mock_font.render.assert_called()
+        # 一時停止画面を描画
+        self.ui_renderer.render_pause_overlay()
+        
+        # 半透明オーバーレイと"PAUSED"テキストが描画されることを確認
+        self.assertGreater(self.mock_screen.blit.call_count, 0)
+        self.mock_font.render.assert_called()
+
+    def test_render_pause_overlay_reuses_surface(self):
+        """一時停止オーバーレイが使い回されるテスト"""
+        self.ui_renderer.render_pause_overlay()
+        overlay = self.ui_renderer._pause_overlay
+        self.assertEqual(overlay.get_size(), (800, 600))
+        
+        self.ui_renderer.render_pause_overlay()
+        
+        # 2回目の描画でも同じサーフェスが使われる
+        self.assertIs(self.ui_renderer._pause_overlay, overlay)
+        self.mock_screen.blit.assert_any_call(overlay, (0, 0))
 
     def test_add_judgment_feedback(self):
         """判定フィードバック追加のテスト"""
-        # 判定結果を作成
-        judgment_result = JudgmentResult(
-            judgment='perfect',
-            timing_diff=10.0,
-            score_gained=100,
-            combo_multiplier=1.1
-        )
+        judgment_result = _PERFECT_RESULT
         
         # 初期状態では active_judgments が空
         self.assertEqual(len(self.ui_renderer.active_judgments), 0)
         
-        with patch('pygame.time.get_ticks', return_value=1000):
-            # 判定フィードバックを追加
-            self.ui_renderer.add_judgment_feedback(judgment_result)
+        # 判定フィードバックを追加
+        self.mock_ticks.return_value = 1000
+        self.ui_renderer.add_judgment_feedback(judgment_result)
         
         # active_judgments に追加されることを確認
         self.assertEqual(len(self.ui_renderer.active_judgments), 1)
@@ -312,28 +361,61 @@ class TestUIRenderer(unittest.TestCase):
         feedback = self.ui_renderer.active_judgments[0]
         self.assertEqual(feedback['result'], judgment_result)
         self.assertEqual(feedback['start_time'], 1000)
-        self.assertEqual(feedback['position'], (400, 400))
+        self.assertEqual(feedback['position'], (400, 300))
 
     def test_update_judgment_fade(self):
         """判定フィードバックのフェードアウトテスト"""
-        # 判定結果を追加
-        judgment_result = JudgmentResult(
-            judgment='perfect',
-            timing_diff=10.0,
-            score_gained=100,
-            combo_multiplier=1.1
-        )
-        
-        with patch('pygame.time.get_ticks', return_value=1000):
-            self.ui_renderer.add_judgment_feedback(judgment_result)
+        judgment_result = _PERFECT_RESULT
+        
+        self.mock_ticks.return_value = 1000
+        self.ui_renderer.add_judgment_feedback(judgment_result)
         
         # 時間経過後のアップデート
-        with patch('pygame.time.get_ticks', return_value=2500):  # 1.5秒後
-            self.ui_renderer.update(16.67)  # 60FPS相当
+        self.mock_ticks.return_value = 2500  # 1.5秒後
+        self.ui_renderer.update(16.67)  # 60FPS相当
         
         # フィードバックが自動的に削除されることを確認
         self.assertEqual(len(self.ui_renderer.active_judgments), 0)
 
+    def test_update_removes_only_expired_judgments(self):
+        """期限切れの判定フィードバックだけが削除されるテスト"""
+        judgment_result = _GOOD_RESULT
+        
+        for start_time in (1000, 1400, 1800):
+            self.mock_ticks.return_value = start_time
+            self.ui_renderer.add_judgment_feedback(judgment_result)
+        
+        # 1000msのものだけが表示時間を過ぎている
+        self.mock_ticks.return_value = 2000
+        self.ui_renderer.update(16.67)
+        
+        start_times = [feedback['start_time'] for feedback in self.ui_renderer.active_judgments]
+        self.assertEqual(start_times, [1400, 1800])
+
+    def test_judgment_alpha_table(self):
+        """判定フィードバックのフェードアウト値のテスト"""
+        alpha_table = self.ui_renderer._alpha_table
+        
+        # フェード開始までは不透明、表示時間の終わりで透明
+        self.assertEqual(alpha_table[0], 255)
+        self.assertEqual(alpha_table[UIRenderer.JUDGMENT_FADE_TIME], 255)
+        self.assertEqual(alpha_table[750], 127)
+        self.assertEqual(alpha_table[UIRenderer.JUDGMENT_DISPLAY_TIME], 0)
+
+    def test_render_active_judgments_before_start(self):
+        """開始時刻より前の判定フィードバックは不透明で描画されるテスト"""
+        self.mock_ticks.return_value = 1000
+        self.ui_renderer.add_judgment_feedback(_PERFECT_RESULT)
+        text_surface = pygame.Surface((10, 10))
+        self.mock_font_large.render.return_value = text_surface
+        
+        # 時計が開始時刻より前を指している
+        self.mock_ticks.return_value = 990
+        self.ui_renderer.render_active_judgments()
+        
+        self.assertEqual(text_surface.get_alpha(), 255)
+        self.mock_screen.blit.assert_called_once()
+
     def test_render_frame_integration(self):
         """フレーム描画統合テスト"""
         # テスト用ゲーム状態を作成
@@ -343,20 +425,16 @@ class TestUIRenderer(unittest.TestCase):
             'score': 12345,
             'combo': 25,
             'multiplier': 1.2,
-            'last_judgment': JudgmentResult('perfect', 10.0, 100, 1.1),
+            'last_judgment': _PERFECT_RESULT,
             'music_name': 'Test Song',
             'progress': 0.5,
             'paused': False
         }
         
-        with patch.object(self.ui_renderer, 'font') as mock_font, \
-             patch('pygame.draw.circle') as mock_draw_circle, \
+        with patch('pygame.draw.circle') as mock_draw_circle, \
              patch('pygame.draw.line') as mock_draw_line, \
              patch('pygame.display.flip') as mock_flip:
             
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
             # フレームを描画
             self.ui_renderer.render_frame(game_state)
             
@@ -364,9 +442,46 @@ class TestUIRenderer(unittest.TestCase):
             self.mock_screen.fill.assert_called()           # 背景クリア
             mock_draw_circle.assert_called()                # ノート描画
             mock_draw_line.assert_called()                  # 判定ライン描画
-            self.assertGreater(mock_font.render.call_count, 0)  # テキスト描画
+            self.assertGreater(self.mock_font.render.call_count, 0)  # テキスト描画
             mock_flip.assert_called_once()                  # 画面更新
 
+    def test_render_frame_updates_dirty_rects_after_first_frame(self):
+        """2フレーム目以降は変化した範囲だけ画面更新されるテスト"""
+        game_state = {
+            'notes': [Note(hit_time=1000.0)],
+            'current_time': 0.0,
+            'score': 100,
+            'combo': 1,
+            'multiplier': 1.0,
+            'last_judgment': None,
+            'music_name': 'Test Song',
+            'progress': 0.5,
+            'paused': False
+        }
+        
+        with patch('pygame.draw.rect'), \
+             patch('pygame.draw.line'), \
+             patch('pygame.display.flip') as mock_flip, \
+             patch('pygame.display.update') as mock_update:
+            
+            # 最初のフレームは画面全体を更新
+            self.ui_renderer.render_frame(game_state)
+            mock_flip.assert_called_once()
+            mock_update.assert_not_called()
+            first_rects = list(self.ui_renderer._previous_dirty_rects)
+            
+            # 2フレーム目は前フレームと今フレームの描画範囲だけを更新
+            self.ui_renderer.render_frame(game_state)
+            mock_flip.assert_called_once()
+            mock_update.assert_called_once()
+            updated_rects = mock_update.call_args[0][0]
+            self.assertEqual(len(updated_rects), len(first_rects) * 2)
+            
+            # 切り替え後は再び画面全体を更新
+            self.ui_renderer.invalidate()
+            self.ui_renderer.render_frame(game_state)
+            self.assertEqual(mock_flip.call_count, 2)
+
     def test_render_frame_with_pause(self):
         """一時停止状態でのフレーム描画テスト"""
         # 一時停止状態のゲーム状態を作成
@@ -382,12 +497,7 @@ class TestUIRenderer(unittest.TestCase):
             'paused': True
         }
         
-        with patch.object(self.ui_renderer, 'font') as mock_font, \
-             patch('pygame.display.flip') as mock_flip:
-            
-            mock_surface = Mock()
-            mock_font.render = Mock(return_value=mock_surface)
-            
+        with patch('pygame.display.flip') as mock_flip:
             # フレームを描画
             self.ui_renderer.render_frame(game_state)
             